@@ -1,11 +1,10 @@
-from flask import Flask, render_template, request, redirect, url_for, send_from_directory
-from novel_rewrite_app import NovelRewriteApp # Import your core research logic
+from flask import Flask, render_template, request, redirect, url_for, send_from_directory, jsonify, Response, stream_with_context
+from novel_rewrite_app import NovelRewriteApp, ResearchJobQueue # Import your core research logic
 import json
 import logging
 from pathlib import Path
 from werkzeug.utils import secure_filename # Import secure_filename
 import os # Import os module
-from PyPDF2 import PdfReader
 from typing import Optional # Import Optional for type hinting
 from datetime import datetime # Import datetime for timestamp
 
@@ -37,6 +36,7 @@ def allowed_file(filename):
 
 # --- Initialize the NovelRewriteApp ---
 novel_app = None
+job_queue = None
 try:
     config_path = 'config.json'
     if not Path(config_path).exists():
@@ -44,6 +44,11 @@ try:
         raise FileNotFoundError(f"Missing {config_path}")
 
     novel_app = NovelRewriteApp()
+    # Research runs in background workers so requests return immediately
+    job_queue = ResearchJobQueue(novel_app, max_workers=novel_app.config["jobs"]["max_workers"],
+                                 lease_seconds=novel_app.config["jobs"]["lease_seconds"])
+    # Reject oversized request bodies before they are read
+    app.config['MAX_CONTENT_LENGTH'] = int(novel_app.config["uploads"]["max_size_mb"] * 1024 * 1024)
     logger.info("NovelRewriteApp initialized successfully.")
 except FileNotFoundError:
     logger.critical(f"Failed to load {config_path}. The research app will not function without it.")
@@ -58,23 +63,24 @@ def index():
     """Renders the main page with the research form."""
     return render_template('index.html', results=None)
 
-@app.route('/research', methods=['POST'])
-def perform_research():
-    """Handles the research request from the web form."""
-    if novel_app is None:
-        return render_template('index.html', error="Research app not initialized. Check server logs (flask_app.log) for configuration errors."), 500
+def _parse_research_form():
+    """Reads the research form (and optional PDF upload) into job parameters.
 
+    Returns (params, None) on success or (None, (message, status_code)) on invalid input.
+    """
     topic = request.form.get('topic')
     context = request.form.get('context')
     keywords_str = request.form.get('keywords')
     keywords = [kw.strip() for kw in keywords_str.split(',') if kw.strip()] if keywords_str else []
+    # Checkbox: skip cached search results and query the search engines again
+    refresh_search = request.form.get('refresh_search') == 'on'
+    # Checkbox: re-extract only new or changed pages and update the topic's results file in place
+    incremental = request.form.get('incremental') == 'on'
 
     if not topic:
-        return render_template('index.html', error="Research topic is required."), 400
+        return None, ("Research topic is required.", 400)
 
-    uploaded_pdf_url = None
     uploaded_pdf_filename = None
-    extracted_pdf_text = None
 
     # Handle PDF file upload
     if 'pdf_file' in request.files:
@@ -83,51 +89,188 @@ def perform_research():
             logger.info("No PDF file selected for upload.")
         elif file and allowed_file(file.filename or ''):
             filename = secure_filename(file.filename or '')
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(file_path)
-            uploaded_pdf_url = url_for('uploaded_file', filename=filename)
-            uploaded_pdf_filename = filename
-            logger.info(f"PDF file uploaded: {filename}")
-            # Extract text from PDF for use as context
+            # Streamed to a uniquely named file so same-named uploads don't overwrite each other
             try:
-                reader = PdfReader(file_path)
-                extracted_text = ''
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        extracted_text += page_text + '\n'
-                extracted_pdf_text = extracted_text
-            except Exception as e:
-                logger.error(f'Error extracting text from PDF: {e}')
+                file_path = str(novel_app.pdf.save_upload(file.stream, directory=app.config['UPLOAD_FOLDER'],
+                                                          prefix=f"{Path(filename).stem}_"))
+            except ValueError as e:
+                return None, (str(e), 413)
+            uploaded_pdf_filename = os.path.basename(file_path)
+            logger.info(f"PDF file uploaded: {filename} -> {uploaded_pdf_filename}")
+            # Only linked from the results: PDF text is never used as research context
         else:
             logger.warning(f"Attempted to upload disallowed file type: {file.filename}")
-            return render_template('index.html', error="Invalid file type for upload. Only PDFs are allowed."), 400
+            return None, ("Invalid file type for upload. Only PDFs are allowed.", 400)
+
+    params = {
+        "topic": topic,
+        # Only use user-provided context, never PDF text
+        "context": context or "",
+        "keywords": keywords,
+        # Refreshing also skips answering from previously extracted pages
+        "options": {"use_search_cache": not refresh_search, "use_local_corpus": False if refresh_search else None,
+                    "incremental": incremental},
+        "metadata": {"uploaded_pdf_filename": uploaded_pdf_filename}
+    }
+    return params, None
+
+def _display_results(job):
+    """Builds the template's results dict from a finished job."""
+    synthesis = job.result or {}
+    uploaded_pdf_filename = job.metadata.get("uploaded_pdf_filename")
+    return {
+        "topic": synthesis.get("topic", job.topic),
+        "summary": synthesis.get("summary", "No summary available."),
+        "total_sources": synthesis.get("total_sources", 0),
+        "key_facts": synthesis.get("key_facts", [])[:5],
+        "output_file": synthesis.get("output_file", "Not saved to file (check logs)."),
+        "uploaded_pdf_url": url_for('uploaded_file', filename=uploaded_pdf_filename) if uploaded_pdf_filename else None, # Pass the URL to the template
+        "uploaded_pdf_filename": uploaded_pdf_filename, # Pass the filename to the template
+        "sources": synthesis.get("sources", [])
+    }
+
+@app.route('/research', methods=['POST'])
+def perform_research():
+    """Handles the research request from the web form by queueing a background job."""
+    if job_queue is None:
+        return render_template('index.html', error="Research app not initialized. Check server logs (flask_app.log) for configuration errors."), 500
+
+    params, error = _parse_research_form()
+    if error:
+        message, status_code = error
+        return render_template('index.html', error=message), status_code
+
+    logger.info(f"Received research request for topic: '{params['topic']}'")
+    job_id = job_queue.submit(**params)
+    return redirect(url_for('job_view', job_id=job_id), code=303)
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queues a research job and returns its id as JSON."""
+    if job_queue is None:
+        return jsonify({"error": "Research app not initialized."}), 500
+
+    params, error = _parse_research_form()
+    if error:
+        message, status_code = error
+        return jsonify({"error": message}), status_code
+
+    job_id = job_queue.submit(**params)
+    return jsonify({"job_id": job_id, "status_url": url_for('job_status', job_id=job_id)}), 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Returns a job's status, and its results once finished, as JSON."""
+    job = job_queue.get(job_id) if job_queue else None
+    if job is None:
+        return jsonify({"error": "Unknown job."}), 404
 
-    # Do NOT use extracted PDF text as context for research
-    # if not context and extracted_pdf_text:
-    #     context = extracted_pdf_text[:2000]  # Limit context length for safety
+    payload = {
+        "job_id": job.id,
+        "topic": job.topic,
+        "status": job.status,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "error": job.error
+    }
+    if job.status == 'done':
+        payload["results"] = _display_results(job)
+    return jsonify(payload)
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Streams a job's progress events to the browser as server-sent events."""
+    if job_queue is None or job_queue.get(job_id) is None:
+        return jsonify({"error": "Unknown job."}), 404
+
+    def generate():
+        for event in job_queue.iter_events(job_id):
+            if event is None:
+                yield ": keep-alive\n\n"  # SSE comment so proxies don't drop an idle stream
+            else:
+                yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/jobs/<job_id>/view', methods=['GET'])
+def job_view(job_id):
+    """Renders a job's results, or a live progress page while the job is running."""
+    job = job_queue.get(job_id) if job_queue else None
+    if job is None:
+        return render_template('index.html', error="Unknown research job."), 404
+
+    if job.status == 'failed':
+        return render_template('index.html', error=f"An error occurred during research: {job.error}. Please check the 'flask_app.log' file for details.")
+    if job.status == 'done':
+        return render_template('index.html', results=_display_results(job))
+    return render_template('index.html', job=job)
+
+@app.route('/search', methods=['GET'])
+def search():
+    """Full-text search over previously extracted web pages and PDF pages, as JSON."""
+    if novel_app is None:
+        return jsonify({"error": "Research app not initialized."}), 500
+
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "Query parameter 'q' is required."}), 400
+    limit = min(request.args.get('limit', 10, type=int), 100)
+    source = request.args.get('source')
+    sources = (source,) if source in ('web', 'pdf') else ('web', 'pdf')
+
+    start = datetime.now()
+    results = novel_app.search_corpus(query, limit=limit, sources=sources)
+    elapsed_ms = (datetime.now() - start).total_seconds() * 1000
+    return jsonify({"query": query, "results": results, "elapsed_ms": round(elapsed_ms, 2)})
+
+@app.route('/upload_pdf', methods=['POST'])
+def upload_pdf():
+    """Extracts an uploaded PDF and streams its pages back as newline-delimited JSON.
+
+    Accepts a multipart form with a 'pdf_file' field, or the raw PDF as an application/pdf
+    body, which is streamed straight to disk without being buffered first.
+    """
+    if novel_app is None:
+        return jsonify({"error": "Research app not initialized."}), 500
+
+    if request.mimetype == 'application/pdf':
+        file = request.stream
+    else:
+        file = request.files.get('pdf_file')
+        if file is None or file.filename == '':
+            return jsonify({"error": "No PDF file selected for upload."}), 400
+        if not allowed_file(file.filename):
+            return jsonify({"error": "Invalid file type for upload. Only PDFs are allowed."}), 400
 
     try:
-        logger.info(f"Received research request for topic: '{topic}'")
-        # Only use user-provided context, never PDF text
-        synthesis = novel_app.run_research_workflow(topic, context or "", keywords)
-        logger.info(f"Research completed for topic: '{topic}'")
-
-        display_results = {
-            "topic": synthesis.get("topic", topic),
-            "summary": synthesis.get("summary", "No summary available."),
-            "total_sources": synthesis.get("total_sources", 0),
-            "key_facts": synthesis.get("key_facts", [])[:5],
-            "output_file": synthesis.get("output_file", "Not saved to file (check logs)."),
-            "uploaded_pdf_url": uploaded_pdf_url, # Pass the URL to the template
-            "uploaded_pdf_filename": uploaded_pdf_filename, # Pass the filename to the template
-            "sources": synthesis.get("sources", [])
-        }
-        return render_template('index.html', results=display_results)
-
-    except Exception as e:
-        logger.error(f"An error occurred during research execution for topic '{topic}': {e}", exc_info=True)
-        return render_template('index.html', error=f"An error occurred during research: {e}. Please check the 'flask_app.log' file for details."), 500
+        records = novel_app.process_uploaded_pdf(file)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 413
+
+    def generate():
+        # One record per line, sent as each page is extracted
+        try:
+            for record in records:
+                for image in record.get("images", []):
+                    image["url"] = url_for('pdf_image', image_id=image["id"])
+                yield json.dumps(record) + "\n"
+        except Exception as e:
+            logger.error(f"Error processing uploaded PDF: {e}", exc_info=True)
+            yield json.dumps({"type": "error", "error": str(e)}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/pdf_images/<image_id>')
+def pdf_image(image_id):
+    """Serves an extracted PDF image from the content-addressed image store."""
+    relative_path = novel_app.image_store.relative_path(image_id) if novel_app else None
+    if relative_path is None:
+        return jsonify({"error": "Unknown image."}), 404
+    # Ids are content hashes, so a given URL always returns the same bytes
+    return send_from_directory(novel_app.image_store.directory.resolve(), relative_path,
+                               mimetype='image/png', max_age=31536000)
 
 # New route to serve uploaded files
 @app.route('/uploads/<filename>')
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTML parser backends used by Novel Rewrite App
+=============================================================
+
+Runs every installed backend (selectolax, lxml, html.parser) over a corpus
+of saved pages and reports throughput plus output parity against the
+html.parser baseline.
+
+Usage:
+    python benchmark_parsers.py                      # pages from http_cache/responses.db
+    python benchmark_parsers.py --corpus saved_pages # *.html files in a directory
+"""
+
+import argparse
+import difflib
+import sqlite3
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import List
+
+from novel_rewrite_app import available_html_parsers, parse_html
+
+BASELINE = "html.parser"
+
+
+def load_corpus(corpus_dir: str, cache_db: str) -> List[bytes]:
+    """Load saved pages from a directory of HTML files or from the response cache"""
+    if corpus_dir:
+        paths = sorted(Path(corpus_dir).glob("*.htm*"))
+        return [path.read_bytes() for path in paths]
+
+    if not Path(cache_db).exists():
+        return []
+    conn = sqlite3.connect(cache_db)
+    rows = conn.execute("SELECT body FROM responses").fetchall()
+    conn.close()
+    return [zlib.decompress(row[0]) for row in rows]
+
+
+def similarity(a: str, b: str) -> float:
+    """Word-level similarity between two extracted texts (1.0 = identical)"""
+    return difflib.SequenceMatcher(None, a.split(), b.split(), autojunk=False).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HTML parser backends on saved pages")
+    parser.add_argument("--corpus", default="", help="directory of saved .html pages")
+    parser.add_argument("--cache-db", default="http_cache/responses.db", help="response cache to read pages from")
+    parser.add_argument("--budget", type=int, default=5000, help="max_content_length used for extraction")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the corpus per backend")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus, args.cache_db)
+    if not pages:
+        print("No pages found. Run some research first or pass --corpus DIR.")
+        return 1
+
+    total_mb = sum(len(page) for page in pages) / (1024 * 1024)
+    print(f"Corpus: {len(pages)} pages, {total_mb:.1f} MB\n")
+
+    baseline = [parse_html(page, BASELINE, args.budget) for page in pages]
+
+    print(f"{'backend':<12} {'pages/s':>10} {'MB/s':>8} {'speedup':>8} {'title match':>12} {'content sim':>12}")
+    baseline_rate = None
+    for backend in reversed(available_html_parsers()):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            outputs = [parse_html(page, backend, args.budget) for page in pages]
+        elapsed = (time.perf_counter() - start) / args.repeat
+
+        rate = len(pages) / elapsed
+        if backend == BASELINE:
+            baseline_rate = rate
+        title_match = sum(out[0] == base[0] for out, base in zip(outputs, baseline)) / len(pages)
+        content_sim = sum(similarity(out[1], base[1]) for out, base in zip(outputs, baseline)) / len(pages)
+
+        print(f"{backend:<12} {rate:>10.1f} {total_mb / elapsed:>8.2f} {rate / baseline_rate:>7.1f}x "
+              f"{title_match:>11.0%} {content_sim:>11.1%}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
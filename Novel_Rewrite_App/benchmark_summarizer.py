@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark the extractive summarizer used by Novel Rewrite App
+=============================================================
+
+Summarizes growing numbers of stored sources with each ranking method and
+reports the time spent segmenting, building the TF-IDF matrix and ranking.
+Sources are the pages already extracted into novel_research.db, reused in
+a cycle when more are requested than the database holds.
+
+Usage:
+    python benchmark_summarizer.py                        # 25 to 400 sources
+    python benchmark_summarizer.py --sources 100 1000     # custom source counts
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from itertools import cycle, islice
+
+from novel_rewrite_app import rank_sentences, segment_sentences, summarize_documents, tfidf_matrix
+
+METHODS = ["textrank", "centroid"]
+
+
+def load_contents(db_path: str) -> list:
+    """Content of every extracted page in the research database"""
+    with sqlite3.connect(db_path) as conn:
+        return [row[0] for row in conn.execute("SELECT content FROM extracted_info WHERE content != ''")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the extractive summarizer on stored sources")
+    parser.add_argument("--db", default="novel_research.db", help="research database to read pages from")
+    parser.add_argument("--sources", type=int, nargs="+", default=[25, 50, 100, 200, 400],
+                        help="numbers of sources to summarize")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    contents = load_contents(args.db)
+    if not contents:
+        print(f"No extracted pages in {args.db}. Run some research first or pass --db.")
+        return 1
+    print(f"Corpus: {len(contents)} stored pages\n")
+
+    print(f"{'sources':>8} {'sentences':>10} {'method':<9} {'segment':>8} {'tf-idf':>8} {'rank':>8} {'total':>8}")
+    for source_count in args.sources:
+        documents = list(islice(cycle(contents), source_count))
+        for method in METHODS:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                sentences = [text[s.start:s.end] for text in documents
+                             for s in segment_sentences(text) if 40 <= s.length <= 400]
+                segmented = time.perf_counter()
+                matrix = tfidf_matrix(sentences)
+                built = time.perf_counter()
+                rank_sentences(matrix, method)
+                ranked = time.perf_counter()
+                summarize_documents(documents, method=method)
+                total = time.perf_counter() - ranked
+                timings.append((segmented - start, built - segmented, ranked - built, total))
+
+            segment, build, rank, total = min(timings, key=lambda timing: timing[3])
+            print(f"{source_count:>8} {len(sentences):>10} {method:<9} {segment:>7.3f}s {build:>7.3f}s "
+                  f"{rank:>7.3f}s {total:>7.3f}s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,29 +16,66 @@ Date: 2025
 """
 
 import os
+import argparse
 import json
 import time
+import zlib
+import hashlib
+import threading
+import itertools
+import weakref
+import shutil
+import tempfile
+import uuid
+import socket
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator, NamedTuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
+from functools import partial
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 import sqlite3
+import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup
+# Optional faster HTML parser backends
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+try:
+    import lxml  # noqa: F401 - enables BeautifulSoup's 'lxml' tree builder
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except ImportError:
+    try:
+        from PyPDF2 import PdfReader  # pypdf's predecessor, same reader API
+        PYPDF_AVAILABLE = True
+    except ImportError:
+        PYPDF_AVAILABLE = False
 import re
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse, urljoin, urlunparse, parse_qsl, urlencode
 import logging
 import fitz  # PyMuPDF
 try:
     import pytesseract
-    TESSERACT_AVAILABLE = True
+    # The Python wrapper is useless without the tesseract binary it shells out to
+    TESSERACT_AVAILABLE = shutil.which(pytesseract.pytesseract.tesseract_cmd) is not None
 except ImportError:
     TESSERACT_AVAILABLE = False
-    print("Warning: pytesseract not available. OCR functionality will be disabled.")
+if not TESSERACT_AVAILABLE:
+    print("Warning: pytesseract or the tesseract binary not available. OCR functionality will be disabled.")
 from PIL import Image
-import io
-import base64
 from pdf2image import convert_from_path
 
 # Configure logging
@@ -52,6 +89,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Receives structured workflow progress events, e.g. {"event": "page_extracted", ...}
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
 @dataclass
 class ResearchQuery:
     """Represents a research query with metadata"""
@@ -60,6 +100,7 @@ class ResearchQuery:
     keywords: List[str]
     created_at: str
     priority: int = 1
+    id: Optional[int] = None  # research_queries row id, set once saved
     
 @dataclass
 class SearchResult:
@@ -70,6 +111,7 @@ class SearchResult:
     source: str
     relevance_score: float
     domain: str
+    id: Optional[int] = None  # search_results row id, set once saved
     
 @dataclass
 class ExtractedInfo:
@@ -81,15 +123,1016 @@ class ExtractedInfo:
     summary: str
     extracted_at: str
     word_count: int
+    content_hash: Optional[str] = None  # sha256 of the fetched page body
+    duplicate_of: Optional[str] = None  # URL of an already indexed page with near-identical content
+
+def _same_extraction(current: Optional[ExtractedInfo], previous: Optional[ExtractedInfo]) -> bool:
+    """Whether two extractions of one URL (either may be missing) come from the same page body"""
+    if current is None or previous is None:
+        return current is previous
+    return current.content_hash is not None and current.content_hash == previous.content_hash
+
+class DomainThrottle:
+    """Spaces out requests to the same host while letting different hosts run in parallel"""
+
+    def __init__(self, delay: float = 1.0, max_per_domain: int = 1):
+        self.delay = delay
+        self.max_per_domain = max(1, max_per_domain)
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_slot: Dict[str, float] = {}
+
+    @contextmanager
+    def slot(self, domain: str):
+        """Block until a request to `domain` is allowed, then hold the slot for its duration"""
+        with self._lock:
+            semaphore = self._semaphores.setdefault(
+                domain, threading.BoundedSemaphore(self.max_per_domain))
+
+        with semaphore:
+            # Reserve the next start time for this host so waiting threads queue up in order
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_slot.get(domain, now))
+                self._next_slot[domain] = start + self.delay
+
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+class FetchScheduler:
+    """Shared extraction pool that runs each distinct URL once, however many topics ask for it"""
+    
+    def __init__(self, extract: Callable[[str, Optional[ExtractedInfo]], Any], max_workers: int = 5):
+        self._extract = extract
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="fetch")
+        self._lock = threading.Lock()
+        self._futures: Dict[Tuple[str, Optional[str]], Future] = {}
+    
+    def submit(self, url: str, previous: Optional[ExtractedInfo] = None) -> Future:
+        """Future for a URL's extraction, started on first request and shared afterwards.
+        
+        Callers holding different previous extractions of the URL (by content hash) get
+        separate extractions, as the result depends on what it is compared against.
+        """
+        key = (normalize_url(url), previous.content_hash if previous is not None else None)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = self._futures[key] = self._executor.submit(self._extract, url, previous)
+            return future
+    
+    @property
+    def unique_urls(self) -> int:
+        """How many distinct URLs have been scheduled"""
+        with self._lock:
+            return len({url for url, _ in self._futures})
+    
+    def shutdown(self):
+        """Wait for scheduled fetches to finish and stop the pool"""
+        self._executor.shutdown(wait=True)
+
+class HttpClient:
+    """Shared keep-alive HTTP session with per-host connection pools, retries and timeouts"""
+
+    def __init__(self, http_config: Dict[str, Any]):
+        self.config = http_config
+        self.timeout = (http_config["connect_timeout"], http_config["read_timeout"])
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': http_config["user_agent"]})
+
+        default_adapter = self._make_adapter(http_config["pool_maxsize"])
+        self.session.mount('https://', default_adapter)
+        self.session.mount('http://', default_adapter)
+
+        # Hosts we hit in bursts (e.g. the search API) can get a larger pool;
+        # requests picks the adapter with the longest matching prefix
+        for host, pool_size in http_config["host_pool_maxsize"].items():
+            host_adapter = self._make_adapter(pool_size)
+            self.session.mount(f'https://{host}/', host_adapter)
+            self.session.mount(f'http://{host}/', host_adapter)
+
+    def _make_adapter(self, pool_maxsize: int) -> HTTPAdapter:
+        """Create a pooled adapter with the configured retry/backoff policy"""
+        retry = Retry(
+            total=self.config["max_retries"],
+            backoff_factor=self.config["backoff_factor"],
+            status_forcelist=self.config["retry_status_codes"],
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        return HTTPAdapter(
+            pool_connections=self.config["pool_connections"],
+            pool_maxsize=pool_maxsize,
+            max_retries=retry
+        )
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the shared session, applying the default timeout"""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so equivalent spellings share one cache key"""
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    # Drop default ports and the fragment, sort query parameters
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((scheme, netloc, parsed.path or '/', parsed.params, query, ''))
+
+@dataclass
+class CachedResponse:
+    """A page body stored in the response cache with its validators"""
+    url: str
+    body: bytes
+    content_type: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+class ResponseCache:
+    """On-disk HTTP response cache with TTL, LRU size bound and ETag/Last-Modified revalidation"""
+
+    def __init__(self, directory: str, ttl_seconds: float, max_size_mb: float):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(Path(directory) / "responses.db"), check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                content_type TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)')
+        self._conn.commit()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        """Cache key for a URL: hash of its normalized form"""
+        return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the cached response for a URL (fresh or stale), updating its LRU position"""
+        key = self._key(url)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT url, body, content_type, etag, last_modified, stored_at FROM responses WHERE key = ?',
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+
+        return CachedResponse(
+            url=row[0],
+            body=zlib.decompress(row[1]),
+            content_type=row[2] or "",
+            etag=row[3],
+            last_modified=row[4],
+            stored_at=row[5]
+        )
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Check whether an entry can be served without revalidation"""
+        return time.time() - entry.stored_at < self.ttl_seconds
+
+    def put(self, url: str, body: bytes, headers: Dict[str, str]):
+        """Store a compressed response body and evict least recently used entries over the size bound"""
+        compressed = zlib.compress(body, 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute('''
+                INSERT OR REPLACE INTO responses
+                (key, url, body, content_type, etag, last_modified, stored_at, last_access, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (self._key(url), url, compressed, headers.get('Content-Type', ''),
+                  headers.get('ETag'), headers.get('Last-Modified'), now, now, len(compressed)))
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, url: str, headers: Dict[str, str]):
+        """Mark an entry fresh again after a 304 Not Modified response"""
+        with self._lock:
+            self._conn.execute('''
+                UPDATE responses
+                SET stored_at = ?, etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified)
+                WHERE key = ?
+            ''', (time.time(), headers.get('ETag'), headers.get('Last-Modified'), self._key(url)))
+            self._conn.commit()
+
+    def record(self, outcome: str):
+        """Count a cache outcome: hits, revalidated or misses"""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return a copy of the hit/revalidated/miss counters"""
+        with self._lock:
+            return dict(self.stats)
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes (caller holds the lock)"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY last_access').fetchall():
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        """Close the cache index"""
+        with self._lock:
+            self._conn.close()
+
+# Modulus for the MinHash permutations (the Mersenne prime 2^61 - 1)
+MINHASH_PRIME = np.uint64((1 << 61) - 1)
+
+def shingle_hashes(text: str, size: int, unit: str = "word") -> np.ndarray:
+    """CRC32 hashes of a text's overlapping word (or character) n-grams, lowercased"""
+    if unit == "word":
+        tokens = re.findall(r'\w+', text.lower())
+        grams = [' '.join(tokens[i:i + size]) for i in range(max(1, len(tokens) - size + 1))] if tokens else []
+    else:
+        text = ' '.join(text.lower().split())
+        grams = [text[i:i + size] for i in range(max(1, len(text) - size + 1))] if text else []
+    return np.unique(np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams),
+                                 dtype=np.uint64, count=len(grams)))
+
+class MinHasher:
+    """MinHash signatures whose matching fraction estimates the Jaccard similarity of two shingle sets"""
+    
+    def __init__(self, num_perm: int = 128):
+        # Permutation parameters come from fixed digests, so persisted signatures stay comparable
+        digests = [hashlib.sha256(f"minhash:{i}".encode()).digest() for i in range(num_perm)]
+        self.num_perm = num_perm
+        self._a = np.array([(int.from_bytes(d[:4], 'little') >> 1) | 1 for d in digests], dtype=np.uint64)[:, None]
+        self._b = np.array([int.from_bytes(d[4:8], 'little') for d in digests], dtype=np.uint64)[:, None]
+    
+    def signature(self, hashes: np.ndarray) -> Optional[np.ndarray]:
+        """Signature of a set of shingle hashes, or None for an empty set"""
+        if hashes.size == 0:
+            return None
+        # a < 2^31 and hashes < 2^32, so a * x + b never overflows 64 bits
+        return ((self._a * hashes[None, :] + self._b) % MINHASH_PRIME).min(axis=1)
+    
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the sets behind two signatures"""
+        return float(np.mean(first == second))
+
+class MinHashIndex:
+    """LSH index of MinHash signatures for finding near-duplicates, optionally persisted to SQLite"""
+    
+    def __init__(self, num_perm: int = 128, bands: int = 16, threshold: float = 0.8,
+                 path: Optional[str] = None):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.num_perm = num_perm
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: Dict[Tuple[int, bytes], set] = {}
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute('CREATE TABLE IF NOT EXISTS signatures (key TEXT PRIMARY KEY, signature BLOB NOT NULL)')
+            self._conn.commit()
+            for key, blob in self._conn.execute('SELECT key, signature FROM signatures'):
+                signature = np.frombuffer(blob, dtype=np.uint64)
+                # Signatures from a different num_perm setting can't be compared
+                if signature.size == num_perm:
+                    self._insert(key, signature)
+    
+    def _bands(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(self.num_perm // self.rows)]
+    
+    def _insert(self, key: str, signature: np.ndarray):
+        """Add or replace a key's signature in memory (caller holds the lock)"""
+        old = self._signatures.pop(key, None)
+        if old is not None:
+            for band in self._bands(old):
+                self._buckets[band].discard(key)
+        self._signatures[key] = signature
+        for band in self._bands(signature):
+            self._buckets.setdefault(band, set()).add(key)
+    
+    def _find(self, key: str, signature: np.ndarray) -> Optional[str]:
+        """Most similar other key at or above the threshold (caller holds the lock)"""
+        candidates = set()
+        for band in self._bands(signature):
+            candidates |= self._buckets.get(band, set())
+        candidates.discard(key)
+        best, best_score = None, self.threshold
+        for candidate in sorted(candidates):
+            score = MinHasher.similarity(signature, self._signatures[candidate])
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
+    
+    def find_or_add(self, key: str, signature: np.ndarray) -> Optional[str]:
+        """Return the key this one near-duplicates, or index it as new content and return None"""
+        with self._lock:
+            original = self._find(key, signature)
+            if original is not None:
+                return original
+            self._insert(key, signature)
+            if self._conn is not None:
+                self._conn.execute('INSERT OR REPLACE INTO signatures (key, signature) VALUES (?, ?)',
+                                   (key, signature.tobytes()))
+                self._conn.commit()
+            return None
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._signatures)
+    
+    def close(self):
+        """Close the persisted index"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+
+def cluster_near_duplicates(texts: List[str], hasher: MinHasher, threshold: float, bands: int = 16,
+                            shingle_size: int = 4) -> List[List[int]]:
+    """Group the indices of near-identical texts (character shingles), clusters and members in input order"""
+    index = MinHashIndex(hasher.num_perm, bands, threshold)
+    clusters: Dict[str, List[int]] = {}
+    for position, text in enumerate(texts):
+        signature = hasher.signature(shingle_hashes(text, shingle_size, unit="char"))
+        key = str(position)
+        original = index.find_or_add(key, signature) if signature is not None else None
+        clusters.setdefault(original or key, []).append(position)
+    return list(clusters.values())
+
+# Words whose trailing dot doesn't end a sentence (single letters, as in initials, are handled separately)
+ABBREVIATIONS = (
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'vs', 'etc', 'e.g', 'i.e', 'cf', 'al',
+    'fig', 'no', 'vol', 'approx', 'ca', 'inc', 'ltd', 'co', 'corp', 'u.s', 'u.k', 'jan', 'feb',
+    'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec'
+)
+
+def _compile_sentence_boundary() -> re.Pattern:
+    """One pattern for every sentence boundary, so segmentation is a single finditer scan.
+    
+    A boundary is ., ! or ? (plus any closing quotes/brackets) followed by whitespace and a
+    character that isn't lowercase, or by the end of the text. Decimals like 3.14 never match
+    since no whitespace follows their dot; lookbehinds (one per abbreviation length, as they
+    must be fixed-width) rule out abbreviations and initials. Trailing whitespace is group 1.
+    """
+    by_length: Dict[int, List[str]] = {}
+    for abbreviation in ABBREVIATIONS:
+        by_length.setdefault(len(abbreviation), []).append(re.escape(abbreviation))
+    not_abbreviation = ''.join(f"(?<!\\b(?i:{'|'.join(words)})\\.)" for _, words in sorted(by_length.items()))
+    return re.compile(r'[.!?](?<!\b[A-Za-z]\.)' + not_abbreviation +
+                      r'[.!?]*["\'”’)\]]*(?=\s+[^\sa-z]|\s*$)(\s*)')
+
+SENTENCE_BOUNDARY = _compile_sentence_boundary()
+# Fact cues and digits in one matcher; case-insensitive, as lowercasing can shift offsets (İ -> i̇)
+FACT_PATTERN = re.compile(r'research|study|found|discovered|according to|\d', re.IGNORECASE)
+
+class Sentence(NamedTuple):
+    """A sentence's span in its document, plus the features fact scoring needs"""
+    start: int
+    end: int
+    fact_cue: bool  # contains a fact cue phrase or a number
+    
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+def segment_sentences(text: str, limit: Optional[int] = None) -> List[Sentence]:
+    """Split text into sentences in one scan, stopping after `limit` sentences"""
+    spans: List[Tuple[int, int]] = []
+    start = len(text) - len(text.lstrip())
+    for match in SENTENCE_BOUNDARY.finditer(text, start):
+        spans.append((start, match.start(1)))
+        start = match.end()
+        if limit is not None and len(spans) >= limit:
+            break
+    else:
+        # Trailing text without final punctuation
+        if start < len(text):
+            spans.append((start, len(text.rstrip())))
+    
+    return [Sentence(start, end, FACT_PATTERN.search(text, start, end) is not None) for start, end in spans]
+
+# Words too common to say anything about what a sentence is about
+STOP_WORDS = frozenset('''
+    a about after also an and are as at be been but by can could did do does for from had has have he her his
+    how i if in into is it its may more most no not of on or our over she so such than that the their them
+    then there these they this those to was we were what when where which who will with would you your
+'''.split())
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+class TfidfMatrix(NamedTuple):
+    """Sparse sentence-by-term TF-IDF matrix in coordinate form, rows sorted and L2-normalized"""
+    rows: np.ndarray
+    cols: np.ndarray
+    values: np.ndarray
+    shape: Tuple[int, int]
+    
+    def dot(self, vector: np.ndarray) -> np.ndarray:
+        """X @ vector, for a vector over terms"""
+        return np.bincount(self.rows, weights=self.values * vector[self.cols], minlength=self.shape[0])
+    
+    def tdot(self, vector: np.ndarray) -> np.ndarray:
+        """X.T @ vector, for a vector over sentences"""
+        return np.bincount(self.cols, weights=self.values * vector[self.rows], minlength=self.shape[1])
+    
+    def cosine(self, first: int, second: int) -> float:
+        """Cosine similarity of two rows"""
+        (a_start, b_start), (a_end, b_end) = np.searchsorted(self.rows, [[first, second], [first + 1, second + 1]])
+        _, a_index, b_index = np.intersect1d(self.cols[a_start:a_end], self.cols[b_start:b_end],
+                                             assume_unique=True, return_indices=True)
+        return float(np.dot(self.values[a_start:a_end][a_index], self.values[b_start:b_end][b_index]))
+
+def tfidf_matrix(sentences: List[str]) -> TfidfMatrix:
+    """TF-IDF matrix of the sentences (each sentence is a document), built without per-pair loops"""
+    token_lists = [[token for token in TOKEN_PATTERN.findall(sentence.lower()) if token not in STOP_WORDS]
+                   for sentence in sentences]
+    lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+    tokens = np.array([token for tokens in token_lists for token in tokens], dtype=str)
+    if tokens.size == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return TfidfMatrix(empty, empty, np.zeros(0), (len(sentences), 0))
+    
+    vocabulary, term_ids = np.unique(tokens, return_inverse=True)
+    sentence_ids = np.repeat(np.arange(len(sentences)), lengths)
+    # One key per (sentence, term) pair; np.unique both counts and sorts them by sentence
+    keys, counts = np.unique(sentence_ids * len(vocabulary) + term_ids.ravel(), return_counts=True)
+    rows, cols = np.divmod(keys, len(vocabulary))
+    
+    document_frequency = np.bincount(cols, minlength=len(vocabulary))
+    idf = np.log(len(sentences) / document_frequency) + 1.0
+    values = (1.0 + np.log(counts)) * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=len(sentences)))
+    return TfidfMatrix(rows, cols, values / norms[rows], (len(sentences), len(vocabulary)))
+
+def rank_sentences(matrix: TfidfMatrix, method: str = "textrank", damping: float = 0.85,
+                   max_iterations: int = 100, tolerance: float = 1e-6) -> np.ndarray:
+    """Score sentences by TextRank over their cosine-similarity graph, or by similarity to the centroid.
+    
+    The n x n similarity matrix X @ X.T is never built: each power iteration applies it as two
+    sparse matrix-vector products, so the cost grows with the number of nonzeros, not n^2.
+    """
+    count = matrix.shape[0]
+    if method == "centroid":
+        return matrix.dot(matrix.tdot(np.ones(count)) / count)
+    
+    # Similarity to itself is 1 for every sentence with terms; self-loops are left out
+    self_similarity = np.bincount(matrix.rows, weights=matrix.values ** 2, minlength=count)
+    
+    def similarity(vector: np.ndarray) -> np.ndarray:
+        return matrix.dot(matrix.tdot(vector)) - self_similarity * vector
+    
+    degree = similarity(np.ones(count))
+    connected = degree > 1e-9
+    scores = np.full(count, 1.0 / count)
+    for _ in range(max_iterations):
+        # Sentences similar to nothing spread their score evenly, as in PageRank
+        spread = (1.0 - damping) / count + damping * scores[~connected].sum() / count
+        updated = spread + damping * similarity(np.where(connected, scores / np.where(connected, degree, 1.0), 0.0))
+        converged = np.abs(updated - scores).sum() < tolerance
+        scores = updated
+        if converged:
+            break
+    return scores
+
+def summarize_documents(documents: List[str], length: int = 5, method: str = "textrank",
+                        max_similarity: float = 0.5) -> str:
+    """Extractive summary across documents: the top-ranked sentences, skipping near-repeats, in reading order"""
+    sentences = []
+    for text in documents:
+        # Very short or very long "sentences" are usually navigation or run-together page text
+        sentences.extend(text[s.start:s.end] for s in segment_sentences(text) if 40 <= s.length <= 400)
+    if len(sentences) <= length:
+        return " ".join(sentences)
+    
+    matrix = tfidf_matrix(sentences)
+    scores = rank_sentences(matrix, method)
+    chosen: List[int] = []
+    for index in np.argsort(-scores, kind="stable"):
+        if all(matrix.cosine(index, other) < max_similarity for other in chosen):
+            chosen.append(int(index))
+            if len(chosen) == length:
+                break
+    return " ".join(sentences[index] for index in sorted(chosen))
+
+# Elements tried in order when looking for a page's main content
+CONTENT_SELECTORS = [
+    'main', 'article', '.content', '.post-content', '.entry-content',
+    '#content', '#main', '.main-content'
+]
+
+def _collect_soup_text(element, budget: int) -> Tuple[str, int]:
+    """Join an element's text nodes until `budget` characters are collected, counting the words of all of them"""
+    parts = []
+    length = 0
+    word_count = 0
+    for text in element.stripped_strings:
+        word_count += len(text.split())
+        if length >= budget:
+            continue  # past the budget, text nodes are only counted
+        # Clean up whitespace inside each text node
+        text = re.sub(r'\s+', ' ', text)
+        parts.append(text)
+        length += len(text) + 1
+    return ' '.join(parts), word_count
+
+def _parse_with_soup(body: bytes, budget: int, builder: str) -> Tuple[str, str, int]:
+    """Extract (title, main content) with BeautifulSoup using the given tree builder"""
+    soup = BeautifulSoup(body, builder)
+    title = soup.find('title')
+    title_text = title.get_text().strip() if title else "No title"
+    
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+    
+    content, word_count = "", 0
+    for selector in CONTENT_SELECTORS:
+        element = soup.select_one(selector)
+        if element:
+            content, word_count = _collect_soup_text(element, budget)
+            break
+    
+    # Fallback to body text
+    if not content:
+        content, word_count = _collect_soup_text(soup, budget)
+    
+    return title_text, content[:budget], word_count
+
+def _parse_with_selectolax(body: bytes, budget: int) -> Tuple[str, str, int]:
+    """Extract (title, main content) with selectolax's lexbor engine"""
+    tree = LexborHTMLParser(body)
+    title = tree.css_first('title')
+    title_text = title.text().strip() if title else "No title"
+    tree.strip_tags(['script', 'style'])
+    
+    content = ""
+    for selector in CONTENT_SELECTORS:
+        node = tree.css_first(selector)
+        if node:
+            content = node.text(separator=' ', strip=True)
+            break
+    
+    # Fallback to the whole document, like BeautifulSoup's get_text
+    if not content and tree.root is not None:
+        content = tree.root.text(separator=' ', strip=True)
+    
+    # Text is rendered in C, so count words and cut at the budget afterwards
+    word_count = len(content.split())
+    content = re.sub(r'\s+', ' ', content[:budget * 2])
+    return title_text, content[:budget], word_count
+
+def available_html_parsers() -> List[str]:
+    """HTML parser backends usable in this environment, fastest first"""
+    parsers = []
+    if SELECTOLAX_AVAILABLE:
+        parsers.append("selectolax")
+    if LXML_AVAILABLE:
+        parsers.append("lxml")
+    parsers.append("html.parser")
+    return parsers
+
+def resolve_html_parser(name: str) -> str:
+    """Map a configured parser name to an installed backend, falling back to html.parser"""
+    available = available_html_parsers()
+    if name == "auto":
+        return available[0]
+    if name not in available:
+        logger.warning(f"HTML parser '{name}' is not available, falling back to html.parser")
+        return "html.parser"
+    return name
+
+def parse_html(body: bytes, parser: str, budget: int) -> Tuple[str, str, int]:
+    """Extract (title, main content, word count) from an HTML page with the given backend.
+    
+    The content is cut to `budget` characters, but the word count covers the whole main content.
+    """
+    if parser == "selectolax":
+        return _parse_with_selectolax(body, budget)
+    return _parse_with_soup(body, budget, parser)
+
+@dataclass
+class PdfImageRef:
+    """Reference to an image embedded in a PDF; pixels are only decoded on demand"""
+    pdf_path: str
+    page: int
+    index: int
+    xref: int
+    id: Optional[str] = None  # image store id, once extracted into a store (None if not storable)
+    
+    def to_png(self, doc: Optional["fitz.Document"] = None) -> Optional[bytes]:
+        """Decode the image as PNG bytes, or None if it isn't GRAY/RGB"""
+        owned = doc is None
+        if owned:
+            doc = fitz.open(self.pdf_path)
+        try:
+            pix = fitz.Pixmap(doc, self.xref)
+            if pix.n - pix.alpha >= 4:  # CMYK and other colorspaces are skipped
+                return None
+            return pix.tobytes("png")
+        finally:
+            if owned:
+                doc.close()
+
+@dataclass
+class PdfPageRender:
+    """Lazy handle for rendering one PDF page to an image"""
+    pdf_path: str
+    page: int
+    
+    def to_png(self, dpi: int = 150) -> bytes:
+        """Render the page at the given resolution as PNG bytes"""
+        with fitz.open(self.pdf_path) as doc:
+            return doc.load_page(self.page - 1).get_pixmap(dpi=dpi).tobytes("png")
+
+@dataclass
+class PdfPage:
+    """One PDF page: its text layer, embedded image references and a render handle"""
+    page: int
+    text: str
+    images: List[PdfImageRef]
+    render: PdfPageRender
+
+def _render_pdf_page(page: "fitz.Page", dpi: int, grayscale: bool) -> Image.Image:
+    """Render one PDF page to a PIL image without going through an encoded format"""
+    pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY if grayscale else fitz.csRGB, alpha=False)
+    return Image.frombytes("L" if grayscale else "RGB", (pix.width, pix.height), pix.samples)
+
+def _ocr_pdf_page(pdf_path: str, page_num: int, ocr_config: Dict[str, Any]) -> str:
+    """Render one page and run tesseract on it; runs in a worker process with its own document"""
+    if ocr_config["renderer"] == "pdf2image":
+        image = convert_from_path(pdf_path, dpi=ocr_config["dpi"], grayscale=ocr_config["grayscale"],
+                                  first_page=page_num, last_page=page_num)[0]
+    else:
+        with fitz.open(pdf_path) as doc:
+            image = _render_pdf_page(doc.load_page(page_num - 1), ocr_config["dpi"], ocr_config["grayscale"])
+    return pytesseract.image_to_string(image, lang=ocr_config["language"])
+
+def _open_pymupdf_text(pdf_path: str, doc: "fitz.Document") -> Callable[[int], str]:
+    """Page-text reader backed by PyMuPDF's own text layer extraction"""
+    return lambda page_num: doc.load_page(page_num - 1).get_text()
+
+def _open_pypdf_text(pdf_path: str, doc: "fitz.Document") -> Callable[[int], str]:
+    """Page-text reader backed by pure-Python pypdf (or PyPDF2)"""
+    reader = PdfReader(pdf_path)
+    return lambda page_num: reader.pages[page_num - 1].extract_text() or ""
+
+PDF_TEXT_ENGINES = {
+    "pymupdf": _open_pymupdf_text,
+    "pypdf": _open_pypdf_text,
+}
+
+def available_pdf_engines() -> List[str]:
+    """PDF text engines usable in this environment, fastest first"""
+    engines = ["pymupdf"]
+    if PYPDF_AVAILABLE:
+        engines.append("pypdf")
+    return engines
+
+def resolve_pdf_engine(name: str) -> str:
+    """Map a configured engine name to an installed engine, falling back to PyMuPDF"""
+    if name not in available_pdf_engines():
+        logger.warning(f"PDF engine '{name}' is not available, falling back to pymupdf")
+        return "pymupdf"
+    return name
+
+def extract_pdf_text(pdf_path: str, engine: str) -> List[str]:
+    """Text layer of every page of a PDF, using the given engine"""
+    with fitz.open(pdf_path) as doc:
+        page_text = PDF_TEXT_ENGINES[engine](pdf_path, doc)
+        return [page_text(page_num) for page_num in range(1, len(doc) + 1)]
+
+def _iter_pdf_page_list(pdf_path: str, page_numbers: List[int], engine: str = "pymupdf",
+                        image_dir: Optional[str] = None) -> Iterator[PdfPage]:
+    """Yield the given (1-based) pages one at a time from a single open document.
+    
+    With image_dir, each page's GRAY/RGB images are also decoded and saved to the image
+    store there, setting their ids; an image reused across these pages is decoded once.
+    """
+    store = ImageStore(image_dir) if image_dir else None
+    stored_xrefs: Dict[int, Optional[str]] = {}
+    with fitz.open(pdf_path) as doc:
+        page_text = PDF_TEXT_ENGINES[engine](pdf_path, doc)
+        for page_num in page_numbers:
+            page = doc.load_page(page_num - 1)
+            images = [PdfImageRef(pdf_path, page_num, img_index, img[0])
+                      for img_index, img in enumerate(page.get_images())]
+            if store is not None:
+                for ref in images:
+                    if ref.xref not in stored_xrefs:
+                        img_data = ref.to_png(doc)
+                        stored_xrefs[ref.xref] = store.put(img_data) if img_data is not None else None
+                    ref.id = stored_xrefs[ref.xref]
+            yield PdfPage(
+                page=page_num,
+                text=page_text(page_num),
+                images=images,
+                render=PdfPageRender(pdf_path, page_num)
+            )
+
+def _extract_pdf_page_list(pdf_path: str, page_numbers: List[int], engine: str = "pymupdf",
+                           image_dir: Optional[str] = None) -> List[PdfPage]:
+    """Extract the given pages; runs in a worker process with its own document.
+    
+    Image decoding and PNG encoding happen here too when image_dir is given; the image
+    store's atomic writes make concurrent workers safe.
+    """
+    return list(_iter_pdf_page_list(pdf_path, page_numbers, engine, image_dir))
+
+def _pdf_file_hash(pdf_path: str) -> str:
+    """SHA-256 of a PDF file's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# Font entries that point at objects deciding how glyph codes map to extracted text
+_PDF_FONT_KEYS = ("DescendantFonts", "FontDescriptor", "Encoding", "ToUnicode", "FontFile", "FontFile2", "FontFile3")
+
+def _pdf_font_digest(doc: "fitz.Document", xref: int) -> bytes:
+    """Digest of a font's dictionaries and raw streams (encoding, ToUnicode map, embedded program)"""
+    digest = hashlib.sha256()
+    pending, seen = [xref], set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        digest.update(doc.xref_object(current, compressed=True).encode('utf-8'))
+        if doc.xref_is_stream(current):
+            digest.update(doc.xref_stream_raw(current) or b'')
+        for key in _PDF_FONT_KEYS:
+            kind, value = doc.xref_get_key(current, key)
+            if kind in ("xref", "array"):
+                pending.extend(int(ref) for ref in re.findall(r'(\d+) \d+ R', value))
+    return digest.digest()
+
+def _pdf_resource_refs(doc: "fitz.Document", xref: int, kind: str) -> List[int]:
+    """Xrefs listed in one of an object's resource dictionaries (kind is e.g. "Font" or "XObject")"""
+    entry, value = doc.xref_get_key(xref, f"Resources/{kind}")
+    if entry == "xref":
+        value = doc.xref_object(int(value.split()[0]), compressed=True)
+    elif entry != "dict":
+        return []
+    return [int(ref) for ref in re.findall(r'(\d+) \d+ R', value)]
+
+def _pdf_xobject_digest(doc: "fitz.Document", xref: int, digests: Dict[int, bytes]) -> bytes:
+    """Digest of an XObject's dictionary and raw stream, plus the fonts and XObjects a Form XObject uses"""
+    digest = hashlib.sha256(doc.xref_object(xref, compressed=True).encode('utf-8'))
+    digest.update(doc.xref_stream_raw(xref) or b'')
+    if doc.xref_get_key(xref, "Subtype")[1] == "/Form":
+        for font in _pdf_resource_refs(doc, xref, "Font"):
+            if font not in digests:
+                digests[font] = _pdf_font_digest(doc, font)
+            digest.update(digests[font])
+        for nested in _pdf_resource_refs(doc, xref, "XObject"):
+            digest.update(_pdf_cached_xobject_digest(doc, nested, digests))
+    return digest.digest()
+
+def _pdf_cached_xobject_digest(doc: "fitz.Document", xref: int, digests: Dict[int, bytes]) -> bytes:
+    """XObject digest, computed once per document"""
+    if xref not in digests:
+        digests[xref] = b''  # a malformed form that draws itself must not recurse forever
+        digests[xref] = _pdf_xobject_digest(doc, xref, digests)
+    return digests[xref]
+
+def _pdf_page_hash(doc: "fitz.Document", page: "fitz.Page", engine: str,
+                   digests: Optional[Dict[int, bytes]] = None) -> str:
+    """Hash of what a page draws (content streams, fonts, images and Form XObjects) and the engine reading it.
+    
+    Form XObjects are hashed with everything they draw in turn, as a page's own content may be no
+    more than a call to one. Pass the same digests dict for every page of a document so shared
+    fonts and XObjects are hashed once.
+    """
+    digests = {} if digests is None else digests
+    digest = hashlib.sha256(engine.encode('utf-8'))
+    digest.update(page.read_contents())
+    for font in page.get_fonts():
+        if font[0] not in digests:
+            digests[font[0]] = _pdf_font_digest(doc, font[0])
+        digest.update(digests[font[0]])
+    for img in page.get_images():
+        digest.update(doc.xref_stream_raw(img[0]) or b'')
+    # Top-level forms only (invoker 0); nested ones are covered by their parent's digest
+    for xobject in page.get_xobjects():
+        if xobject[2] == 0:
+            digest.update(_pdf_cached_xobject_digest(doc, xobject[0], digests))
+    return digest.hexdigest()
+
+class ImageStore:
+    """Content-addressed on-disk store for extracted images (one file per distinct PNG)"""
+
+    _ID_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def relative_path(self, image_id: str) -> Optional[str]:
+        """Path of an image inside the store, or None for a malformed id"""
+        if not self._ID_PATTERN.match(image_id):
+            return None
+        return f"{image_id[:2]}/{image_id}.png"
+
+    def put(self, data: bytes) -> str:
+        """Store PNG bytes and return their id; identical images are written only once"""
+        image_id = hashlib.sha256(data).hexdigest()
+        path = self.directory / self.relative_path(image_id)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            # Write to a private temp file first so readers never see a partial image
+            tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        return image_id
+
+    def has(self, image_id: str) -> bool:
+        """Whether an image is in the store"""
+        relative = self.relative_path(image_id)
+        return relative is not None and (self.directory / relative).exists()
+    
+    def get(self, image_id: str) -> Optional[bytes]:
+        """Read a stored image back, or None if it isn't in the store"""
+        relative = self.relative_path(image_id)
+        if relative is None or not (self.directory / relative).exists():
+            return None
+        return (self.directory / relative).read_bytes()
+
+class ResearchDatabase:
+    """Per-thread SQLite connections to the research database, each closed when its thread ends"""
+
+    def __init__(self, db_path: str, db_config: Dict[str, Any]):
+        self.db_path = db_path
+        self.config = db_config
+        self._local = threading.local()
+        # Open connections by token; request and pool threads come and go, so entries are
+        # removed (and closed) by a finalizer on the owning thread rather than kept forever
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening and tuning it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.config["busy_timeout_ms"] / 1000,
+                                   check_same_thread=False)
+            # WAL lets readers run alongside a writer; NORMAL sync skips the fsync per commit
+            conn.execute(f'PRAGMA journal_mode={self.config["journal_mode"]}')
+            conn.execute(f'PRAGMA synchronous={self.config["synchronous"]}')
+            conn.execute(f'PRAGMA busy_timeout={int(self.config["busy_timeout_ms"])}')
+            conn.execute(f'PRAGMA cache_size=-{int(self.config["cache_size_kb"])}')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            self._local.conn = conn
+            token = next(self._tokens)
+            with self._lock:
+                self._connections[token] = conn
+            weakref.finalize(threading.current_thread(), self._release, token)
+        return conn
+
+    def _release(self, token: int):
+        """Close a connection whose thread has ended"""
+        with self._lock:
+            conn = self._connections.pop(token, None)
+        if conn is not None:
+            conn.close()
+    
+    @contextmanager
+    def transaction(self):
+        """Run a block of statements in one transaction: commit on success, roll back on error"""
+        conn = self.connection()
+        with conn:
+            yield conn.cursor()
+
+    def close(self):
+        """Close every connection opened through this database"""
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
 
 class NovelRewriteApp:
     """Main application class for novel rewrite research automation"""
     
+    # Key facts are looked for in this many leading sentences of a page
+    FACT_SCAN_SENTENCES = 20
+    
+    # Schema migrations, applied in order and tracked with PRAGMA user_version
+    SCHEMA_MIGRATIONS = [
+        # 1: index the columns we look rows up by
+        [
+            'CREATE INDEX IF NOT EXISTS idx_research_queries_topic ON research_queries (topic)',
+            'CREATE INDEX IF NOT EXISTS idx_research_queries_created_at ON research_queries (created_at)',
+            'CREATE INDEX IF NOT EXISTS idx_search_results_query_id ON search_results (query_id)',
+            'CREATE INDEX IF NOT EXISTS idx_search_results_url ON search_results (url)',
+            'CREATE INDEX IF NOT EXISTS idx_search_results_domain ON search_results (domain)',
+            'CREATE INDEX IF NOT EXISTS idx_extracted_info_result_id ON extracted_info (result_id)',
+            'CREATE INDEX IF NOT EXISTS idx_extracted_info_url ON extracted_info (url)',
+        ],
+        # 2: full-text indexes over extracted web content and PDF page text, kept in sync by triggers
+        [
+            '''CREATE VIRTUAL TABLE IF NOT EXISTS extracted_info_fts USING fts5(
+                title, content, summary, key_facts,
+                content='extracted_info', content_rowid='id', tokenize='porter unicode61'
+            )''',
+            '''CREATE TRIGGER IF NOT EXISTS extracted_info_fts_insert AFTER INSERT ON extracted_info BEGIN
+                INSERT INTO extracted_info_fts (rowid, title, content, summary, key_facts)
+                VALUES (new.id, new.title, new.content, new.summary, new.key_facts);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS extracted_info_fts_delete AFTER DELETE ON extracted_info BEGIN
+                INSERT INTO extracted_info_fts (extracted_info_fts, rowid, title, content, summary, key_facts)
+                VALUES ('delete', old.id, old.title, old.content, old.summary, old.key_facts);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS extracted_info_fts_update AFTER UPDATE ON extracted_info BEGIN
+                INSERT INTO extracted_info_fts (extracted_info_fts, rowid, title, content, summary, key_facts)
+                VALUES ('delete', old.id, old.title, old.content, old.summary, old.key_facts);
+                INSERT INTO extracted_info_fts (rowid, title, content, summary, key_facts)
+                VALUES (new.id, new.title, new.content, new.summary, new.key_facts);
+            END''',
+            '''CREATE VIRTUAL TABLE IF NOT EXISTS pdf_pages_fts USING fts5(
+                text, content='pdf_pages', content_rowid='id', tokenize='porter unicode61'
+            )''',
+            '''CREATE TRIGGER IF NOT EXISTS pdf_pages_fts_insert AFTER INSERT ON pdf_pages BEGIN
+                INSERT INTO pdf_pages_fts (rowid, text) VALUES (new.id, new.text);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS pdf_pages_fts_delete AFTER DELETE ON pdf_pages BEGIN
+                INSERT INTO pdf_pages_fts (pdf_pages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS pdf_pages_fts_update AFTER UPDATE ON pdf_pages BEGIN
+                INSERT INTO pdf_pages_fts (pdf_pages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+                INSERT INTO pdf_pages_fts (rowid, text) VALUES (new.id, new.text);
+            END''',
+            # Index rows stored before the triggers existed
+            "INSERT INTO extracted_info_fts (extracted_info_fts) VALUES ('rebuild')",
+            "INSERT INTO pdf_pages_fts (pdf_pages_fts) VALUES ('rebuild')",
+        ],
+        # 3: hash of each fetched page body, so incremental runs can tell unchanged pages apart
+        [
+            'ALTER TABLE extracted_info ADD COLUMN content_hash TEXT',
+        ],
+        # 4: near-duplicate pages are stored too, marked with the page they copy
+        [
+            'ALTER TABLE extracted_info ADD COLUMN duplicate_of TEXT',
+        ],
+    ]
+    
     def __init__(self, config_file: str = "config.json"):
         self.config = self._load_config(config_file)
         self.db_path = "novel_research.db"
+        self.db = ResearchDatabase(self.db_path, self.config["database"])
+        self.html_parser = resolve_html_parser(self.config["extraction"]["parser"])
         self.results_dir = Path("research_results")
         self.results_dir.mkdir(exist_ok=True)
+        self.image_store = ImageStore(self.config["pdf"]["image_store_dir"])
+        self.pdf = PdfIngestionService(self.config, self.db, self.image_store)
+        self.http = HttpClient(self.config["http"])
+        cache_config = self.config["http_cache"]
+        self.response_cache = ResponseCache(
+            directory=cache_config["directory"],
+            ttl_seconds=cache_config["ttl_seconds"],
+            max_size_mb=cache_config["max_size_mb"]
+        ) if cache_config["enabled"] else None
+        self.domain_throttle = DomainThrottle(
+            delay=self.config["extraction"]["per_domain_delay"],
+            max_per_domain=self.config["extraction"]["max_requests_per_domain"]
+        )
+        dedup_config = self.config["dedup"]
+        self.minhasher = MinHasher(dedup_config["num_perm"])
+        # Persisted next to the research database so duplicates are recognized across runs
+        self.dedup_index = MinHashIndex(
+            num_perm=dedup_config["num_perm"],
+            bands=dedup_config["bands"],
+            threshold=dedup_config["threshold"],
+            path=str(Path(self.db_path).with_suffix(".minhash.db"))
+        ) if dedup_config["enabled"] else None
         self._init_database()
         
     def _load_config(self, config_file: str) -> Dict[str, Any]:
@@ -112,7 +1155,84 @@ class NovelRewriteApp:
                 "max_content_length": 5000,
                 "min_word_count": 100,
                 "extract_headers": True,
-                "extract_links": False
+                "extract_links": False,
+                "max_download_bytes": 2000000,
+                "allowed_content_types": ["text/html", "application/xhtml+xml"],
+                "parser": "auto",
+                "max_workers": 4,
+                "per_domain_delay": 1.0,
+                "max_requests_per_domain": 1
+            },
+            "http": {
+                "pool_connections": 20,
+                "pool_maxsize": 10,
+                "host_pool_maxsize": {},
+                "max_retries": 3,
+                "backoff_factor": 0.5,
+                "retry_status_codes": [429, 500, 502, 503, 504],
+                "connect_timeout": 5,
+                "read_timeout": 10,
+                "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            },
+            "http_cache": {
+                "enabled": True,
+                "directory": "http_cache",
+                "ttl_seconds": 604800,
+                "max_size_mb": 200
+            },
+            "database": {
+                "journal_mode": "WAL",
+                "synchronous": "NORMAL",
+                "busy_timeout_ms": 5000,
+                "cache_size_kb": 16384
+            },
+            "search_cache": {
+                "enabled": True,
+                "freshness_hours": 24
+            },
+            "jobs": {
+                "max_workers": 2,
+                "lease_seconds": 60
+            },
+            "batch": {
+                "max_workers": 4
+            },
+            "summary": {
+                "method": "textrank",
+                "sentences": 5
+            },
+            "dedup": {
+                "enabled": True,
+                "num_perm": 128,
+                "bands": 16,
+                "threshold": 0.8,
+                "shingle_size": 5,
+                "fact_threshold": 0.7
+            },
+            "ocr": {
+                "renderer": "pymupdf",
+                "dpi": 200,
+                "grayscale": True,
+                "max_pages_in_memory": 4,
+                "language": "eng",
+                "min_text_chars": 100
+            },
+            "local_corpus": {
+                "enabled": True,
+                "min_sources": 5
+            },
+            "uploads": {
+                "max_size_mb": 16,
+                "chunk_size_kb": 256,
+                "temp_dir": ""
+            },
+            "pdf": {
+                "max_workers": 0,
+                "parallel_min_pages": 32,
+                "min_pages_per_task": 8,
+                "image_store_dir": "pdf_images",
+                "page_cache": True,
+                "engine": "pymupdf"
             },
             "storage": {
                 "save_raw_html": False,
@@ -135,10 +1255,22 @@ class NovelRewriteApp:
     
     def _init_database(self):
         """Initialize SQLite database for storing research data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create tables
+        with self.db.transaction() as cursor:
+            self._create_tables(cursor)
+            self._migrate_schema(cursor)
+        logger.info("Database initialized successfully")
+    
+    def _migrate_schema(self, cursor: sqlite3.Cursor):
+        """Apply schema migrations newer than the database's user_version"""
+        version = cursor.execute('PRAGMA user_version').fetchone()[0]
+        for target, statements in enumerate(self.SCHEMA_MIGRATIONS[version:], start=version + 1):
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute(f'PRAGMA user_version = {target}')
+            logger.info(f"Migrated research database to schema version {target}")
+    
+    def _create_tables(self, cursor: sqlite3.Cursor):
+        """Create the research tables if they don't exist yet"""
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS research_queries (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -179,9 +1311,61 @@ class NovelRewriteApp:
             )
         ''')
         
-        conn.commit()
-        conn.close()
-        logger.info("Database initialized successfully")
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS search_cache (
+                engine TEXT NOT NULL,
+                query_text TEXT NOT NULL,
+                num INTEGER NOT NULL,
+                results TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                PRIMARY KEY (engine, query_text, num)
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS research_jobs (
+                id TEXT PRIMARY KEY,
+                topic TEXT NOT NULL,
+                context TEXT,
+                keywords TEXT,
+                options TEXT,
+                metadata TEXT,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT,
+                owner TEXT,
+                heartbeat_at REAL
+            )
+        ''')
+        
+        # Extracted PDF pages, looked up by a hash of the page's content; the integer id is the
+        # full-text index's rowid, which (unlike an implicit rowid) VACUUM never renumbers
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS pdf_pages (
+                id INTEGER PRIMARY KEY,
+                page_hash TEXT NOT NULL UNIQUE,
+                text TEXT NOT NULL,
+                ocr INTEGER NOT NULL,
+                images TEXT NOT NULL,
+                cached_at TEXT NOT NULL
+            )
+        ''')
+        
+        # Page hashes of each PDF file seen, so a re-upload skips hashing its pages, and the
+        # name it was uploaded as, so search hits can name their document
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS pdf_files (
+                file_hash TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                page_hash TEXT NOT NULL,
+                name TEXT,
+                PRIMARY KEY (file_hash, page)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_pdf_files_page_hash ON pdf_files (page_hash)')
     
     def formulate_query(self, topic: str, context: str = "", keywords: List[str] = None) -> ResearchQuery:
         """Formulate a research query based on topic and context"""
@@ -216,28 +1400,26 @@ class NovelRewriteApp:
     
     def _save_query(self, query: ResearchQuery):
         """Save query to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO research_queries (topic, query_text, keywords, created_at, priority)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (query.topic, query.query_text, json.dumps(query.keywords), 
-              query.created_at, query.priority))
-        conn.commit()
-        conn.close()
-    
-    def execute_search(self, query: ResearchQuery) -> List[SearchResult]:
+        with self.db.transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO research_queries (topic, query_text, keywords, created_at, priority)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (query.topic, query.query_text, json.dumps(query.keywords), 
+                  query.created_at, query.priority))
+            query.id = cursor.lastrowid
+    
+    def execute_search(self, query: ResearchQuery, use_cache: bool = True) -> List[SearchResult]:
         """Execute search using configured search engines"""
         results = []
         
         # Try Google Custom Search API if configured
         if (self.config["search_engines"]["google"]["api_key"] and 
             self.config["search_engines"]["google"]["search_engine_id"]):
-            results.extend(self._google_search(query))
+            results.extend(self._cached_search('google', query, self._google_search, use_cache))
         
         # Use DuckDuckGo Instant Answer API as fallback
         if not results:
-            results.extend(self._duckduckgo_search(query))
+            results.extend(self._cached_search('duckduckgo', query, self._duckduckgo_search, use_cache))
         
         # Filter results
         filtered_results = self._filter_results(results)
@@ -249,6 +1431,49 @@ class NovelRewriteApp:
         logger.info(f"Found {len(filtered_results)} relevant results for query: {query.query_text}")
         return filtered_results
     
+    def _cached_search(self, engine: str, query: ResearchQuery, search_fn, use_cache: bool) -> List[SearchResult]:
+        """Serve raw engine results from the search cache while fresh, otherwise call the engine"""
+        cache_config = self.config["search_cache"]
+        num = self.config["filtering"]["max_results_per_query"]
+        
+        if use_cache and cache_config["enabled"]:
+            cached = self._load_cached_search(engine, query.query_text, num)
+            if cached is not None:
+                logger.info(f"Using cached {engine} results for query: {query.query_text}")
+                return cached
+        
+        results = search_fn(query)
+        
+        # Engine failures come back empty and are never cached
+        if results and cache_config["enabled"]:
+            self._store_cached_search(engine, query.query_text, num, results)
+        return results
+    
+    def _load_cached_search(self, engine: str, query_text: str, num: int) -> Optional[List[SearchResult]]:
+        """Load cached results for (engine, query_text, num) if within the freshness window"""
+        row = self.db.connection().execute('''
+            SELECT results, fetched_at FROM search_cache
+            WHERE engine = ? AND query_text = ? AND num = ?
+        ''', (engine, query_text, num)).fetchone()
+        
+        if row is None:
+            return None
+        
+        age = datetime.now() - datetime.fromisoformat(row[1])
+        if age.total_seconds() > self.config["search_cache"]["freshness_hours"] * 3600:
+            return None
+        
+        return [SearchResult(**item) for item in json.loads(row[0])]
+    
+    def _store_cached_search(self, engine: str, query_text: str, num: int, results: List[SearchResult]):
+        """Store raw engine results in the search cache"""
+        with self.db.transaction() as cursor:
+            cursor.execute('''
+                INSERT OR REPLACE INTO search_cache (engine, query_text, num, results, fetched_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (engine, query_text, num, json.dumps([dict(asdict(result), id=None) for result in results]),
+                  datetime.now().isoformat()))
+    
     def _google_search(self, query: ResearchQuery) -> List[SearchResult]:
         """Execute Google Custom Search API"""
         try:
@@ -259,10 +1484,9 @@ class NovelRewriteApp:
                 'num': self.config["filtering"]["max_results_per_query"]
             }
             
-            response = requests.get(
+            response = self.http.get(
                 self.config["search_engines"]["google"]["base_url"],
-                params=params,
-                timeout=10
+                params=params
             )
             response.raise_for_status()
             
@@ -299,7 +1523,7 @@ class NovelRewriteApp:
                 'skip_disambig': '1'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -360,76 +1584,211 @@ class NovelRewriteApp:
         return filtered
     
     def _save_search_results(self, query: ResearchQuery, results: List[SearchResult]):
-        """Save search results to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get query ID
-        cursor.execute('SELECT id FROM research_queries WHERE query_text = ?', (query.query_text,))
-        query_id = cursor.fetchone()[0]
+        """Save search results to database in a single transaction"""
+        if query.id is None:
+            self._save_query(query)
         
-        for result in results:
-            cursor.execute('''
+        with self.db.transaction() as cursor:
+            cursor.executemany('''
                 INSERT INTO search_results 
                 (query_id, title, url, snippet, source, relevance_score, domain)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (query_id, result.title, result.url, result.snippet, 
-                  result.source, result.relevance_score, result.domain))
+            ''', [(query.id, result.title, result.url, result.snippet,
+                   result.source, result.relevance_score, result.domain) for result in results])
+            
+            # The rows just inserted are this query's newest ones, in insertion order
+            cursor.execute('SELECT id FROM search_results WHERE query_id = ? ORDER BY id DESC LIMIT ?',
+                           (query.id, len(results)))
+            row_ids = [row[0] for row in reversed(cursor.fetchall())]
         
-        conn.commit()
-        conn.close()
+        for result, row_id in zip(results, row_ids):
+            result.id = row_id
     
-    def extract_information(self, results: List[SearchResult]) -> List[ExtractedInfo]:
-        """Extract information from search result URLs"""
+    def extract_information(self, results: List[SearchResult],
+                            progress: Optional[ProgressCallback] = None,
+                            scheduler: Optional[FetchScheduler] = None,
+                            previous: Optional[Dict[str, ExtractedInfo]] = None) -> List[ExtractedInfo]:
+        """Extract information from search result URLs concurrently, keeping ranking order.
+        
+        With a scheduler (see run_research_batch), URLs already fetched for another topic
+        in the batch are reused instead of fetched again. previous maps normalized URLs to
+        their last extraction; pages whose body hasn't changed since are returned as-is and
+        not saved again.
+        """
         extracted_data = []
+        if not results:
+            return extracted_data
+
+        extracted_pairs = []
+        cache_before = self.response_cache.snapshot() if self.response_cache else None
+
+        # Different hosts are fetched in parallel; same-host requests are spaced
+        # out by the domain throttle inside _fetch_page
+        max_workers = max(1, min(self.config["extraction"]["max_workers"], len(results)))
+        outcomes: List[Optional[ExtractedInfo]] = [None] * len(results)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extract") as executor:
+            submit = scheduler.submit if scheduler else partial(executor.submit, self._extract_timed)
+            # A shared scheduler hands back one future for repeated URLs, so map futures to ranks
+            futures: Dict[Future, List[int]] = {}
+            for rank, result in enumerate(results):
+                known = (previous or {}).get(normalize_url(result.url))
+                futures.setdefault(submit(result.url, known), []).append(rank)
+
+            # Report pages as they finish so callers can show early results
+            for future in as_completed(futures):
+                for rank in futures[future]:
+                    result = results[rank]
+                    try:
+                        info, elapsed = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to extract from {result.url}: {e}")
+                        continue
+
+                    # A shared fetch hands back whichever topic's record was unchanged, so use our own
+                    known = (previous or {}).get(normalize_url(result.url))
+                    unchanged = info is not None and _same_extraction(info, known)
+                    if unchanged:
+                        info = known
+                        logger.info(f"Unchanged since last extraction: {result.url}")
+                    elif info:
+                        logger.info(f"Extracted info from: {result.url}")
+                    self._emit(progress, "page_extracted", rank=rank + 1, url=result.url, ok=info is not None,
+                               title=info.title if info else None, summary=info.summary if info else None,
+                               elapsed=round(elapsed, 2), unchanged=unchanged,
+                               duplicate_of=info.duplicate_of if info else None)
+                    outcomes[rank] = info
+
+        # Keep the original ranking order; unchanged pages are already stored. Near-duplicates
+        # are stored with duplicate_of set, so incremental runs know them but corpus search skips them
+        for result, info in zip(results, outcomes):
+            if info:
+                extracted_data.append(info)
+                if not _same_extraction(info, (previous or {}).get(normalize_url(result.url))):
+                    extracted_pairs.append((result, info))
+
+        # Save the whole extraction step in one transaction
+        try:
+            self._save_extracted_info(extracted_pairs)
+        except Exception as e:
+            logger.error(f"Failed to save extracted info: {e}")
+
+        if cache_before is not None:
+            cache_after = self.response_cache.snapshot()
+            delta = {outcome: cache_after[outcome] - cache_before[outcome] for outcome in cache_after}
+            logger.info(f"Response cache: {delta['hits']} hits, {delta['revalidated']} revalidated, "
+                        f"{delta['misses']} misses")
+
+        return extracted_data
+
+    def _extract_timed(self, url: str, previous: Optional[ExtractedInfo] = None) -> Tuple[Optional[ExtractedInfo], float]:
+        """Extract from a URL and report how many seconds it took, politeness waits included"""
+        start = time.monotonic()
+        info = self._extract_from_url(url, previous)
+        return info, time.monotonic() - start
+
+    @staticmethod
+    def _emit(progress: Optional[ProgressCallback], event: str, **data):
+        """Send a progress event to the callback; a failing callback never breaks the workflow"""
+        if progress is None:
+            return
+        try:
+            progress({"event": event, **data})
+        except Exception as e:
+            logger.warning(f"Progress callback failed for {event} event: {e}")
+
+    def _fetch_page(self, url: str, revalidate: bool = False) -> bytes:
+        """Fetch a page body, serving it from the response cache when fresh or unchanged.
         
-        for result in results:
+        With revalidate, even fresh entries are checked with the server so changes are seen.
+        """
+        cached = self.response_cache.get(url) if self.response_cache else None
+        if cached and not revalidate and self.response_cache.is_fresh(cached):
+            self.response_cache.record("hits")
+            return cached.body
+
+        # Stale (or forcibly revalidated) entries are checked with a conditional GET
+        headers = {}
+        if cached and cached.etag:
+            headers['If-None-Match'] = cached.etag
+        if cached and cached.last_modified:
+            headers['If-Modified-Since'] = cached.last_modified
+
+        # Be respectful with requests: same-host fetches are spaced out
+        with self.domain_throttle.slot(urlparse(url).netloc):
+            response = self.http.get(url, headers=headers, stream=True)
             try:
-                info = self._extract_from_url(result.url)
-                if info:
-                    extracted_data.append(info)
-                    self._save_extracted_info(result, info)
-                    logger.info(f"Extracted info from: {result.url}")
-                
-                # Be respectful with requests
-                time.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Failed to extract from {result.url}: {e}")
-        
-        return extracted_data
+                if cached and response.status_code == 304:
+                    self.response_cache.refresh(url, response.headers)
+                    self.response_cache.record("revalidated")
+                    return cached.body
+
+                response.raise_for_status()
+                body = self._read_capped_body(response)
+            finally:
+                response.close()
+
+        if self.response_cache:
+            self.response_cache.put(url, body, response.headers)
+            self.response_cache.record("misses")
+        return body
+
+    def _read_capped_body(self, response: requests.Response) -> bytes:
+        """Stream an HTML response body, rejecting other content types and stopping at the byte budget"""
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in self.config["extraction"]["allowed_content_types"]:
+            raise ValueError(f"Skipping non-HTML content type: {content_type}")
+
+        max_bytes = self.config["extraction"]["max_download_bytes"]
+        chunks = []
+        received = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            received += len(chunk)
+            if received >= max_bytes:
+                logger.info(f"Stopped download of {response.url} at {max_bytes} bytes")
+                break
+        return b''.join(chunks)[:max_bytes]
     
-    def _extract_from_url(self, url: str) -> Optional[ExtractedInfo]:
-        """Extract information from a specific URL"""
+    def _extract_from_url(self, url: str, previous: Optional[ExtractedInfo] = None) -> Optional[ExtractedInfo]:
+        """Extract information from a specific URL, returning previous itself if the page is unchanged"""
         # If the URL is a PDF, do not extract text, just provide a link
         if url.lower().endswith('.pdf'):
+            content = "This is a PDF document. Click the link to view it in your browser."
+            # Nothing is fetched, so the placeholder's own hash marks it as unchanged next time
+            content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            if previous is not None and previous.content_hash == content_hash:
+                return previous
             return ExtractedInfo(
                 url=url,
                 title="PDF Document",
-                content="This is a PDF document. Click the link to view it in your browser.",
+                content=content,
                 key_facts=[],
                 summary="PDF document. No text extracted.",
                 extracted_at=datetime.now().isoformat(),
-                word_count=0
+                word_count=0,
+                content_hash=content_hash
             )
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            # Extract title
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else "No title"
-            # Extract main content
-            content = self._extract_main_content(soup)
-            # Extract key facts
-            key_facts = self._extract_key_facts(content)
-            # Generate summary
-            summary = self._generate_summary(content)
-            # Count words
-            word_count = len(content.split())
+            body = self._fetch_page(url, revalidate=previous is not None)
+            content_hash = hashlib.sha256(body).hexdigest()
+            if previous is not None and previous.content_hash == content_hash:
+                return previous
+            # Extract title and main content, stopping once the extraction budget is met
+            title_text, content, word_count = parse_html(body, self.html_parser,
+                                                         self.config["extraction"]["max_content_length"])
+            duplicate_of = self._find_near_duplicate(url, content)
+            stored = self._stored_analysis(duplicate_of) if duplicate_of else None
+            if stored:
+                # Syndicated copy of a page we already analysed: reuse its facts and summary
+                logger.info(f"{url} is a near-duplicate of {duplicate_of}")
+                key_facts, summary = stored
+            else:
+                # Segment once; fact extraction and the summary share the sentence table
+                sentences = segment_sentences(content, limit=self.FACT_SCAN_SENTENCES)
+                # Extract key facts
+                key_facts = self._extract_key_facts(content, sentences)
+                # Generate summary
+                summary = self._generate_summary(content, sentences)
             return ExtractedInfo(
                 url=url,
                 title=title_text,
@@ -437,89 +1796,73 @@ class NovelRewriteApp:
                 key_facts=key_facts,
                 summary=summary,
                 extracted_at=datetime.now().isoformat(),
-                word_count=word_count
+                word_count=word_count,
+                content_hash=content_hash,
+                duplicate_of=duplicate_of
             )
         except Exception as e:
             logger.error(f"Error extracting from {url}: {e}")
             return None
     
-    def _extract_main_content(self, soup: BeautifulSoup) -> str:
-        """Extract main content from webpage"""
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Try to find main content areas
-        content_selectors = [
-            'main', 'article', '.content', '.post-content', '.entry-content',
-            '#content', '#main', '.main-content'
-        ]
-        
-        content = ""
-        for selector in content_selectors:
-            element = soup.select_one(selector)
-            if element:
-                content = element.get_text(separator=' ', strip=True)
-                break
-        
-        # Fallback to body text
-        if not content:
-            content = soup.get_text(separator=' ', strip=True)
-        
-        # Clean up content
-        content = re.sub(r'\s+', ' ', content)
-        return content.strip()
+    def _find_near_duplicate(self, url: str, content: str) -> Optional[str]:
+        """URL of an indexed page with near-identical content; otherwise index this page and return None"""
+        if self.dedup_index is None:
+            return None
+        signature = self.minhasher.signature(shingle_hashes(content, self.config["dedup"]["shingle_size"]))
+        if signature is None:
+            return None
+        return self.dedup_index.find_or_add(url, signature)
+    
+    def _stored_analysis(self, url: str) -> Optional[Tuple[List[str], str]]:
+        """Key facts and summary of a page's latest stored extraction, if any"""
+        row = self.db.connection().execute(
+            'SELECT key_facts, summary FROM extracted_info WHERE url = ? ORDER BY id DESC LIMIT 1', (url,)
+        ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
     
-    def _extract_key_facts(self, content: str) -> List[str]:
-        """Extract key facts from content"""
+    def _extract_key_facts(self, content: str, sentences: Optional[List[Sentence]] = None) -> List[str]:
+        """Extract key facts from content, using its sentence table if already segmented"""
         # Simple fact extraction - in practice you'd use NLP
-        sentences = content.split('.')
+        if sentences is None:
+            sentences = segment_sentences(content, limit=self.FACT_SCAN_SENTENCES)
         facts = []
         
         # Look for sentences with numbers, dates, or specific patterns
-        for sentence in sentences[:20]:  # Check first 20 sentences
-            sentence = sentence.strip()
-            if len(sentence) > 20 and len(sentence) < 200:
-                # Look for patterns that might indicate facts
-                if any(pattern in sentence.lower() for pattern in ['research', 'study', 'found', 'discovered', 'according to']):
-                    facts.append(sentence)
-                elif re.search(r'\d+', sentence):  # Contains numbers
-                    facts.append(sentence)
+        for sentence in sentences[:self.FACT_SCAN_SENTENCES]:
+            if 20 < sentence.length < 200 and sentence.fact_cue:
+                facts.append(content[sentence.start:sentence.end])
             
             if len(facts) >= 5:  # Limit to 5 facts
                 break
         
         return facts
     
-    def _generate_summary(self, content: str) -> str:
-        """Generate a summary of the content"""
+    def _generate_summary(self, content: str, sentences: Optional[List[Sentence]] = None,
+                          length: int = 3) -> str:
+        """Generate a summary of the content: its first `length` sentences"""
         # Simple summary generation - in practice you'd use NLP/LLM
-        sentences = content.split('.')
-        if len(sentences) <= 3:
+        if sentences is None:
+            sentences = segment_sentences(content, limit=length + 1)
+        if len(sentences) <= length:
             return content
         
         # Take first few sentences as summary
-        summary_sentences = sentences[:3]
-        return '. '.join(summary_sentences) + '.'
+        return content[sentences[0].start:sentences[length - 1].end]
     
-    def _save_extracted_info(self, result: SearchResult, info: ExtractedInfo):
-        """Save extracted information to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get result ID
-        cursor.execute('SELECT id FROM search_results WHERE url = ?', (result.url,))
-        result_id = cursor.fetchone()[0]
-        
-        cursor.execute('''
-            INSERT INTO extracted_info 
-            (result_id, url, title, content, key_facts, summary, extracted_at, word_count)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (result_id, info.url, info.title, info.content, 
-              json.dumps(info.key_facts), info.summary, info.extracted_at, info.word_count))
+    def _save_extracted_info(self, extracted: List[Tuple[SearchResult, ExtractedInfo]]):
+        """Save extracted information for a batch of results to database in a single transaction"""
+        if not extracted:
+            return
         
-        conn.commit()
-        conn.close()
+        with self.db.transaction() as cursor:
+            cursor.executemany('''
+                INSERT INTO extracted_info 
+                (result_id, url, title, content, key_facts, summary, extracted_at, word_count,
+                 content_hash, duplicate_of)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(result.id, info.url, info.title, info.content, json.dumps(info.key_facts),
+                   info.summary, info.extracted_at, info.word_count, info.content_hash, info.duplicate_of)
+                  for result, info in extracted])
     
     def synthesize_information(self, extracted_data: List[ExtractedInfo]) -> Dict[str, Any]:
         """Synthesize extracted information into a coherent research summary"""
@@ -534,39 +1877,48 @@ class NovelRewriteApp:
                 "synthesized_at": datetime.now().isoformat()
             }
         
-        # Combine all content
-        all_content = "\n\n".join([info.content for info in extracted_data])
+        # Near-duplicate copies add nothing when their original is also a source
+        urls = {info.url for info in extracted_data}
+        duplicates = [info for info in extracted_data if info.duplicate_of in urls]
+        extracted_data = [info for info in extracted_data if info.duplicate_of not in urls]
+        
         all_facts = []
         for info in extracted_data:
             all_facts.extend(info.key_facts)
         
+        # Keep one fact per cluster of near-identical facts, in source order
+        dedup_config = self.config["dedup"]
+        fact_clusters = cluster_near_duplicates(all_facts, self.minhasher, dedup_config["fact_threshold"],
+                                                dedup_config["bands"])
+        key_facts = [all_facts[cluster[0]] for cluster in fact_clusters]
+        
         # Generate synthesis
         synthesis = {
             "total_sources": len(extracted_data),
             "total_word_count": sum(info.word_count for info in extracted_data),
-            "key_facts": list(set(all_facts))[:10],  # Remove duplicates, limit to 10
-            "summary": self._generate_comprehensive_summary(all_content),
+            "key_facts": key_facts[:10],  # Limit to 10
+            "summary": self._generate_comprehensive_summary([info.content for info in extracted_data]),
             "sources": [info.url for info in extracted_data],
+            "duplicate_sources": [info.url for info in duplicates],
             "synthesized_at": datetime.now().isoformat()
         }
         
         return synthesis
     
-    def _generate_comprehensive_summary(self, content: str) -> str:
-        """Generate a comprehensive summary of all content"""
-        # Simple comprehensive summary - in practice you'd use NLP/LLM
-        sentences = content.split('.')
-        if len(sentences) <= 5:
-            return content
-        
-        # Take first 5 sentences as comprehensive summary
-        summary_sentences = sentences[:5]
-        return '. '.join(summary_sentences) + '.'
+    def _generate_comprehensive_summary(self, contents: List[str]) -> str:
+        """Generate a comprehensive summary of all sources' content"""
+        summary_config = self.config["summary"]
+        if summary_config["method"] != "lead":
+            summary = summarize_documents(contents, summary_config["sentences"], summary_config["method"])
+            if summary:
+                return summary
+        # Take the first sentences of the combined content (also the fallback for fragment-only pages)
+        return self._generate_summary("\n\n".join(contents), length=summary_config["sentences"])
     
-    def save_research(self, synthesis: Dict[str, Any], topic: str, format: str = "markdown"):
-        """Save research results in specified format"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{topic.replace(' ', '_')}_{timestamp}"
+    def save_research(self, synthesis: Dict[str, Any], topic: str, format: str = "markdown",
+                      in_place: bool = False):
+        """Save research results in specified format, to the topic's single file if in_place"""
+        filename = self._research_path(topic, format, timestamped=not in_place).stem
         
         if format.lower() == "markdown":
             self._save_as_markdown(synthesis, filename)
@@ -577,6 +1929,14 @@ class NovelRewriteApp:
         
         logger.info(f"Research saved as {filename}.{format}")
     
+    def _research_path(self, topic: str, format: str, timestamped: bool = False) -> Path:
+        """Results file for a topic: one per run if timestamped, else the one updated in place"""
+        filename = topic.replace(' ', '_')
+        if timestamped:
+            filename += f"_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        extension = {"markdown": "md"}.get(format.lower(), format.lower())
+        return self.results_dir / f"{filename}.{extension}"
+    
     def _save_as_markdown(self, synthesis: Dict[str, Any], filename: str):
         """Save research as Markdown file"""
         filepath = self.results_dir / f"{filename}.md"
@@ -627,158 +1987,845 @@ class NovelRewriteApp:
         
         df.to_csv(filepath, index=False)
     
-    def run_research_workflow(self, topic: str, context: str = "", keywords: List[str] = None) -> Dict[str, Any]:
-        """Run the complete research workflow"""
+    @staticmethod
+    def _fts_query(text: str) -> str:
+        """Turn free text into an FTS5 query matching all of its words, immune to FTS syntax"""
+        return " ".join(f'"{word}"' for word in re.findall(r'\w+', text))
+    
+    def search_corpus(self, query: str, limit: int = 10, sources: Tuple[str, ...] = ("web", "pdf"),
+                      highlight: Tuple[str, str] = ("<mark>", "</mark>")) -> List[Dict[str, Any]]:
+        """Search previously extracted web pages and PDF pages, best BM25 match first.
+        
+        Each hit has source ("web" or "pdf"), id (extracted_info id or PDF page hash),
+        url, title, a snippet with matches wrapped in highlight, and score (lower is better).
+        PDF hits have no url; their title names the page, and document is the name the PDF
+        was last uploaded as (None if unknown).
+        A web page extracted several times is returned once, and a near-duplicate copy only
+        when the page it copies is not stored.
+        """
+        match = self._fts_query(query)
+        if not match or not sources:
+            return []
+        
+        parts = []
+        params: List[Any] = []
+        if "web" in sources:
+            # Title matches count most, then summary and key facts, then body text
+            parts.append('''
+                SELECT 'web', e.id, e.url, e.title, NULL,
+                       snippet(extracted_info_fts, -1, ?, ?, '…', 24),
+                       bm25(extracted_info_fts, 10.0, 1.0, 2.0, 2.0) AS score
+                FROM extracted_info_fts JOIN extracted_info e ON e.id = extracted_info_fts.rowid
+                WHERE extracted_info_fts MATCH ?
+                  AND (e.duplicate_of IS NULL
+                       OR NOT EXISTS (SELECT 1 FROM extracted_info o WHERE o.url = e.duplicate_of))
+            ''')
+            params += [*highlight, match]
+        if "pdf" in sources:
+            # A page shared by several files is attributed to the file recorded last
+            parts.append('''
+                SELECT 'pdf', p.page_hash, NULL,
+                       COALESCE(f.name || ', page ', 'PDF page ') || f.page, f.name,
+                       snippet(pdf_pages_fts, 0, ?, ?, '…', 24),
+                       bm25(pdf_pages_fts) AS score
+                FROM pdf_pages_fts JOIN pdf_pages p ON p.id = pdf_pages_fts.rowid
+                LEFT JOIN pdf_files f ON f.rowid = (SELECT MAX(rowid) FROM pdf_files WHERE page_hash = p.page_hash)
+                WHERE pdf_pages_fts MATCH ?
+            ''')
+            params += [*highlight, match]
+        
+        # Over-fetch so that repeat extractions of one URL can be collapsed
+        rows = self.db.connection().execute(
+            " UNION ALL ".join(parts) + " ORDER BY score LIMIT ?", params + [limit * 4]
+        ).fetchall()
+        
+        hits = []
+        seen = set()
+        for source, ref, url, title, document, snippet, score in rows:
+            key = (source, url or ref)
+            if key in seen:
+                continue
+            seen.add(key)
+            hit = {"source": source, "id": ref, "url": url, "title": title, "snippet": snippet, "score": score}
+            if source == "pdf":
+                hit["document"] = document
+            hits.append(hit)
+            if len(hits) == limit:
+                break
+        return hits
+    
+    def _local_corpus_results(self, query: ResearchQuery) -> Optional[List[ExtractedInfo]]:
+        """Previously extracted pages for a query, best match first, or None if coverage is too thin.
+        
+        Coverage is the number of distinct stored pages matching every word of the topic and
+        keywords (context is left out, as free text rarely matches in full).
+        """
+        local_config = self.config["local_corpus"]
+        hits = self.search_corpus(" ".join([query.topic] + query.keywords), sources=("web",),
+                                  limit=self.config["filtering"]["max_results_per_query"])
+        if len(hits) < local_config["min_sources"]:
+            logger.info(f"Local corpus has {len(hits)} pages for '{query.topic}', "
+                        f"below {local_config['min_sources']}; searching the web")
+            return None
+        
+        ids = [hit["id"] for hit in hits]
+        rows = self.db.connection().execute(f'''
+            SELECT id, url, title, content, key_facts, summary, extracted_at, word_count
+            FROM extracted_info WHERE id IN ({",".join("?" * len(ids))})
+        ''', ids).fetchall()
+        by_id = {row[0]: ExtractedInfo(url=row[1], title=row[2], content=row[3], key_facts=json.loads(row[4]),
+                                       summary=row[5], extracted_at=row[6], word_count=row[7]) for row in rows}
+        logger.info(f"Answering '{query.topic}' from {len(hits)} pages in the local corpus")
+        return [by_id[row_id] for row_id in ids]
+    
+    def _topic_sources(self, topic: str) -> Dict[str, ExtractedInfo]:
+        """Latest extraction of every page previously researched for a topic, keyed by normalized URL"""
+        rows = self.db.connection().execute('''
+            SELECT e.url, e.title, e.content, e.key_facts, e.summary, e.extracted_at, e.word_count,
+                   e.content_hash, e.duplicate_of
+            FROM extracted_info e
+            JOIN search_results s ON s.id = e.result_id
+            JOIN research_queries q ON q.id = s.query_id
+            WHERE q.topic = ?
+            ORDER BY e.id
+        ''', (topic,)).fetchall()
+        return {normalize_url(row[0]): ExtractedInfo(url=row[0], title=row[1], content=row[2],
+                                                     key_facts=json.loads(row[3]), summary=row[4],
+                                                     extracted_at=row[5], word_count=row[6], content_hash=row[7],
+                                                     duplicate_of=row[8])
+                for row in rows}
+    
+    def _last_run_urls(self, topic: str, before_query_id: int) -> set:
+        """Normalized URLs of the search results used by the topic's last run before the given query"""
+        rows = self.db.connection().execute('''
+            SELECT url FROM search_results WHERE query_id = (
+                SELECT MAX(q.id) FROM research_queries q
+                WHERE q.topic = ? AND q.id < ? AND EXISTS (SELECT 1 FROM search_results s WHERE s.query_id = q.id)
+            )
+        ''', (topic, before_query_id)).fetchall()
+        return {normalize_url(row[0]) for row in rows}
+    
+    def run_research_workflow(self, topic: str, context: str = "", keywords: List[str] = None,
+                              use_search_cache: bool = True, use_local_corpus: Optional[bool] = None,
+                              progress: Optional[ProgressCallback] = None,
+                              scheduler: Optional[FetchScheduler] = None,
+                              incremental: bool = False) -> Dict[str, Any]:
+        """Run the complete research workflow, reporting each step to the optional progress callback.
+        
+        With use_local_corpus (default: local_corpus.enabled), topics already well covered by
+        previously extracted pages are answered from the database without searching or fetching.
+        
+        With incremental, the search results are diffed against the pages already extracted for
+        this topic: only new or changed pages are re-extracted, and the topic's one results file
+        is rewritten in place (and only when its sources changed) instead of adding a new one.
+        """
         logger.info(f"Starting research workflow for topic: {topic}")
+        if use_local_corpus is None:
+            # An incremental run exists to pick up changes, so it always checks the web
+            use_local_corpus = self.config["local_corpus"]["enabled"] and not incremental
         
         # Step 1: Formulate query
         query = self.formulate_query(topic, context, keywords)
+        self._emit(progress, "query_formulated", query_text=query.query_text)
         
-        # Step 2: Execute search
-        search_results = self.execute_search(query)
-        
-        # Step 3: Extract information
-        extracted_data = self.extract_information(search_results)
+        # Steps 2-3: Answer from the local corpus when it covers the topic, else search and extract
+        extracted_data = self._local_corpus_results(query) if use_local_corpus else None
+        from_local_corpus = extracted_data is not None
+        if from_local_corpus:
+            self._emit(progress, "local_corpus_hit", source_count=len(extracted_data),
+                       urls=[info.url for info in extracted_data])
+        else:
+            previous = self._topic_sources(topic) if incremental else None
+            last_run_urls = self._last_run_urls(topic, query.id) if incremental else set()
+            search_results = self.execute_search(query, use_cache=use_search_cache)
+            self._emit(progress, "search_complete", result_count=len(search_results),
+                       urls=[result.url for result in search_results])
+            extracted_data = self.extract_information(search_results, progress=progress, scheduler=scheduler,
+                                                      previous=previous)
         
         # Step 4: Synthesize information
         synthesis = self.synthesize_information(extracted_data)
         synthesis['topic'] = topic
+        synthesis['from_local_corpus'] = from_local_corpus
+        self._emit(progress, "synthesis_complete", total_sources=synthesis["total_sources"],
+                   key_fact_count=len(synthesis["key_facts"]))
         
         # Step 5: Save results
-        self.save_research(synthesis, topic, self.config["storage"]["export_format"])
+        export_format = self.config["storage"]["export_format"]
+        if not incremental or from_local_corpus:
+            self.save_research(synthesis, topic, export_format)
+        else:
+            # Diff against the last run's sources, not every page ever extracted for the topic,
+            # so a page that dropped out of the results is reported once
+            current = {normalize_url(info.url): info for info in extracted_data}
+            changed = sorted(url for url in current.keys() | last_run_urls
+                             if not _same_extraction(current.get(url), previous.get(url)))
+            synthesis['changed_sources'] = changed
+            self._emit(progress, "delta_computed", changed=len(changed),
+                       unchanged=len(current) - len(current.keys() & set(changed)))
+            if changed or not self._research_path(topic, export_format).exists():
+                self.save_research(synthesis, topic, export_format, in_place=True)
+            else:
+                logger.info(f"No sources changed for topic {topic}; keeping its results file")
         
         logger.info(f"Research workflow completed for topic: {topic}")
         return synthesis
+    
+    def run_research_batch(self, topics: List[str], context: str = "", keywords: List[str] = None,
+                           **options) -> List[Dict[str, Any]]:
+        """Research many topics concurrently, fetching each distinct URL only once across the batch.
+        
+        Returns one synthesis per topic, in order; a topic that fails gets {"topic", "error"} instead.
+        Extra keyword arguments are passed on to run_research_workflow.
+        """
+        scheduler = FetchScheduler(self._extract_timed, self.config["extraction"]["max_workers"])
+        max_workers = max(1, min(self.config["batch"]["max_workers"], len(topics)))
+        logger.info(f"Starting research batch of {len(topics)} topics")
+        
+        syntheses: List[Dict[str, Any]] = []
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch") as executor:
+                futures = [executor.submit(self.run_research_workflow, topic, context, keywords,
+                                           scheduler=scheduler, **options) for topic in topics]
+                for topic, future in zip(topics, futures):
+                    try:
+                        syntheses.append(future.result())
+                    except Exception as e:
+                        logger.error(f"Research failed for topic {topic}: {e}")
+                        syntheses.append({"topic": topic, "error": str(e)})
+        finally:
+            scheduler.shutdown()
+        
+        logger.info(f"Research batch completed: {len(topics)} topics, {scheduler.unique_urls} unique URLs fetched")
+        return syntheses
 
-    def convert_pdf_to_images(self, pdf_path: str) -> List[Image.Image]:
-        """Converts a PDF file to a list of PIL Image objects."""
+    def close(self):
+        """Release pooled network connections, worker processes, caches, the dedup index and database connections"""
+        self.http.close()
+        self.pdf.close()
+        self.db.close()
+        if self.response_cache:
+            self.response_cache.close()
+        if self.dedup_index:
+            self.dedup_index.close()
+    
+    # PDF processing lives in PdfIngestionService; these are the app's entry points to it
+    
+    def convert_pdf_to_images(self, pdf_path: str, first_page: int = 1,
+                              last_page: Optional[int] = None) -> List[Image.Image]:
+        """Converts a PDF file (or a page range of it) to a list of PIL Image objects."""
+        return self.pdf.convert_pdf_to_images(pdf_path, first_page, last_page)
+    
+    def iter_page_renders(self, pdf_path: str, first_page: int = 1,
+                          last_page: Optional[int] = None) -> Iterator[Tuple[int, Image.Image]]:
+        """Yield (page number, image) for pages first_page..last_page, rendered as they are consumed"""
+        return self.pdf.iter_page_renders(pdf_path, first_page, last_page)
+    
+    def extract_pdf_text_and_images(self, pdf_path: str) -> Dict[str, Any]:
+        """Extract text and images from PDF using PyMuPDF and OCR"""
+        return self.pdf.extract_pdf_text_and_images(pdf_path)
+    
+    def iter_pdf_pages(self, pdf_path: str, page_numbers: Optional[List[int]] = None) -> Iterator[PdfPage]:
+        """Yield a PDF's pages (all, or just page_numbers) lazily in order"""
+        return self.pdf.iter_pdf_pages(pdf_path, page_numbers)
+    
+    def iter_extracted_pdf_pages(self, pdf_path: str, name: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield {"page", "text", "ocr", "images"} records for a PDF in page order, reusing cached pages"""
+        return self.pdf.iter_extracted_pdf_pages(pdf_path, name)
+    
+    def process_uploaded_pdf(self, pdf_file) -> Iterator[Dict[str, Any]]:
+        """Save an uploaded PDF file and return an iterator over its extracted content, page by page"""
+        return self.pdf.process_uploaded_pdf(pdf_file)
+
+class PdfIngestionService:
+    """Single entry point for reading PDFs: text, images, OCR and the page cache.
+    
+    Page text comes from one configurable engine (PyMuPDF by default); images, page
+    hashes and OCR renders always use PyMuPDF.
+    """
+    
+    def __init__(self, config: Dict[str, Any], db: ResearchDatabase, image_store: ImageStore):
+        self.config = config
+        self.db = db
+        self.image_store = image_store
+        self.engine = resolve_pdf_engine(config["pdf"]["engine"])
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_lock = threading.Lock()
+    
+    def close(self):
+        """Shut down the worker processes"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+    
+    def convert_pdf_to_images(self, pdf_path: str, first_page: int = 1,
+                              last_page: Optional[int] = None) -> List[Image.Image]:
+        """Converts a PDF file (or a page range of it) to a list of PIL Image objects."""
         try:
             logger.info(f"Converting PDF to images: {pdf_path}")
-            images = convert_from_path(pdf_path)
+            images = [image for _, image in self.iter_page_renders(pdf_path, first_page, last_page)]
             logger.info(f"Successfully converted PDF to {len(images)} images")
             return images
         except Exception as e:
             logger.error(f"Error converting PDF to images: {e}")
             raise
+    
+    def iter_page_renders(self, pdf_path: str, first_page: int = 1,
+                          last_page: Optional[int] = None) -> Iterator[Tuple[int, Image.Image]]:
+        """Yield (page number, image) for pages first_page..last_page, rendered as they are consumed.
+        
+        Resolution, color mode and backend come from the "ocr" config. At most
+        max_pages_in_memory rendered pages exist at once, so OCR can start on the first
+        page while the rest of a long document is still unrendered.
+        """
+        ocr_config = self.config["ocr"]
+        dpi = ocr_config["dpi"]
+        grayscale = ocr_config["grayscale"]
+        
+        with fitz.open(pdf_path) as doc:
+            last_page = min(last_page or len(doc), len(doc))
+            if ocr_config["renderer"] != "pdf2image":
+                for page_num in range(first_page, last_page + 1):
+                    yield page_num, _render_pdf_page(doc.load_page(page_num - 1), dpi, grayscale)
+                return
+        
+        # pdf2image: render a batch of pages to temporary files, then load them one at a time
+        batch_size = max(1, ocr_config["max_pages_in_memory"])
+        for batch_start in range(first_page, last_page + 1, batch_size):
+            batch_end = min(batch_start + batch_size - 1, last_page)
+            with tempfile.TemporaryDirectory() as output_folder:
+                paths = convert_from_path(pdf_path, dpi=dpi, grayscale=grayscale, first_page=batch_start,
+                                          last_page=batch_end, output_folder=output_folder, paths_only=True)
+                for page_num, path in enumerate(sorted(paths), start=batch_start):
+                    with Image.open(path) as image:
+                        image.load()
+                        yield page_num, image
 
     def extract_pdf_text_and_images(self, pdf_path: str) -> Dict[str, Any]:
         """Extract text and images from PDF using PyMuPDF and OCR"""
         try:
             logger.info(f"Extracting content from PDF: {pdf_path}")
             
-            # Open the PDF
-            doc = fitz.open(pdf_path)
+            if not TESSERACT_AVAILABLE:
+                logger.info("OCR functionality disabled - Tesseract not available")
+            
+            # Extract text and images from each page (or reuse cached pages), across processes
+            # for long documents, and OCR the pages that have no usable text layer
+            text_parts = []
+            images = []
+            ocr_pages = []
+            for page in self.iter_extracted_pdf_pages(pdf_path, Path(pdf_path).name):
+                text_parts.append(f"\n--- Page {page['page']} ---\n{page['text']}\n")
+                images.extend(page["images"])
+                if page["ocr"]:
+                    ocr_pages.append(page["page"])
+            
             extracted_data = {
-                "text": "",
-                "images": [],
-                "page_count": len(doc),
-                "ocr_images": []
+                "text": "".join(text_parts),
+                "images": images,
+                "page_count": len(text_parts),
+                "ocr_pages": ocr_pages
             }
             
-            # Extract text and images from each page
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                
-                # Extract text
-                text = page.get_text()
-                extracted_data["text"] += f"\n--- Page {page_num + 1} ---\n{text}\n"
-                
-                # Extract images
-                image_list = page.get_images()
-                for img_index, img in enumerate(image_list):
-                    xref = img[0]
-                    pix = fitz.Pixmap(doc, xref)
-                    
-                    if pix.n - pix.alpha < 4:  # GRAY or RGB
-                        img_data = pix.tobytes("png")
-                        img_base64 = base64.b64encode(img_data).decode()
-                        extracted_data["images"].append({
-                            "page": page_num + 1,
-                            "index": img_index,
-                            "data": img_base64,
-                            "format": "png"
-                        })
-                    pix = None
-            
-            doc.close()
-            
-            # Convert PDF to images for OCR (if Tesseract is available)
-            if TESSERACT_AVAILABLE:
-                try:
-                    pdf_images = self.convert_pdf_to_images(pdf_path)
-                    for i, img in enumerate(pdf_images):
-                        # Convert PIL image to base64
-                        img_buffer = io.BytesIO()
-                        img.save(img_buffer, format='PNG')
-                        img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-                        
-                        extracted_data["ocr_images"].append({
-                            "page": i + 1,
-                            "data": img_base64,
-                            "format": "png"
-                        })
-                except Exception as e:
-                    logger.warning(f"Could not convert PDF to images for OCR: {e}")
-            else:
-                logger.info("OCR functionality disabled - Tesseract not available")
-            
-            logger.info(f"Successfully extracted content from PDF: {len(extracted_data['images'])} images, {len(extracted_data['ocr_images'])} OCR images")
+            logger.info(f"Successfully extracted content from PDF: {len(extracted_data['images'])} images, {len(extracted_data['ocr_pages'])} OCR pages")
             return extracted_data
             
         except Exception as e:
             logger.error(f"Error extracting PDF content: {e}")
             raise
 
-    def process_uploaded_pdf(self, pdf_file) -> Dict[str, Any]:
-        """Process an uploaded PDF file and return extracted content"""
-        try:
-            # Save uploaded file temporarily
-            temp_path = Path("temp_upload.pdf")
-            pdf_file.save(temp_path)
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Return the shared worker process pool for CPU-bound PDF work, starting it on first use"""
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                max_workers = self.config["pdf"]["max_workers"] or os.cpu_count() or 1
+                self._process_pool = ProcessPoolExecutor(max_workers=max_workers)
+            return self._process_pool
+    
+    def iter_pdf_pages(self, pdf_path: str, page_numbers: Optional[List[int]] = None,
+                       store_images: bool = False) -> Iterator[PdfPage]:
+        """Yield a PDF's pages (all, or just page_numbers) lazily in order, splitting long documents across worker processes.
+        
+        With store_images, the workers also save each page's images to the image store and
+        set the ids on the page's image references.
+        """
+        image_dir = str(self.image_store.directory) if store_images else None
+        if page_numbers is None:
+            with fitz.open(pdf_path) as doc:
+                page_numbers = list(range(1, len(doc) + 1))
+        page_count = len(page_numbers)
+        
+        pdf_config = self.config["pdf"]
+        max_workers = pdf_config["max_workers"] or os.cpu_count() or 1
+        if max_workers <= 1 or page_count < pdf_config["parallel_min_pages"]:
+            yield from _iter_pdf_page_list(pdf_path, page_numbers, self.engine, image_dir)
+            return
+        
+        # Several chunks per worker so a slow chunk (e.g. image-heavy pages) doesn't hold up the rest
+        chunk_size = max(pdf_config["min_pages_per_task"], -(-page_count // (max_workers * 4)))
+        chunks = [page_numbers[start:start + chunk_size] for start in range(0, page_count, chunk_size)]
+        
+        # Keep only a bounded window of chunks in flight so memory stays flat for long documents
+        pool = self._get_process_pool()
+        window = max_workers * 2
+        in_flight = []
+        next_chunk = 0
+        while next_chunk < len(chunks) or in_flight:
+            while next_chunk < len(chunks) and len(in_flight) < window:
+                in_flight.append(pool.submit(_extract_pdf_page_list, pdf_path, chunks[next_chunk],
+                                             self.engine, image_dir))
+                next_chunk += 1
+            yield from in_flight.pop(0).result()
+    
+    def iter_extracted_pdf_pages(self, pdf_path: str, name: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield {"page", "text", "ocr", "images"} records for a PDF in page order, reusing cached pages.
+        
+        Pages are cached by a hash of their content, so re-uploading a file (or a revised
+        version of it) only extracts and OCRs the pages that are new or changed. name is
+        recorded with the file's pages, so search hits can say which document they came from.
+        """
+        with fitz.open(pdf_path) as doc:
+            if not self.config["pdf"]["page_cache"]:
+                yield from self._extract_page_records(pdf_path)
+                return
             
-            # Extract content
-            extracted_data = self.extract_pdf_text_and_images(str(temp_path))
+            # Text differs between engines, so cache entries are per engine
+            file_hash = f"{self.engine}:{_pdf_file_hash(pdf_path)}"
+            digests: Dict[int, bytes] = {}
+            page_hashes = (self._load_pdf_file_pages(file_hash, len(doc))
+                           or [_pdf_page_hash(doc, page, self.engine, digests) for page in doc])
+            cached = self._load_pdf_pages(set(page_hashes))
+            missing = [page_num for page_num, page_hash in enumerate(page_hashes, start=1) if page_hash not in cached]
+            logger.info(f"PDF page cache: {len(doc) - len(missing)} of {len(doc)} pages of {pdf_path} already extracted")
             
-            # Clean up temp file
-            temp_path.unlink()
+            fresh = self._extract_page_records(pdf_path, missing) if missing else iter(())
+            new_pages = {}
+            for page_num, page_hash in enumerate(page_hashes, start=1):
+                if page_hash in cached:
+                    record = cached[page_hash]
+                    yield dict(record, page=page_num, images=[dict(image, page=page_num) for image in record["images"]])
+                    continue
+                
+                record = next(fresh)
+                new_pages[page_hash] = record
+                yield record
             
-            return extracted_data
+            self._store_pdf_pages(file_hash, page_hashes, new_pages, name)
+    
+    def _extract_page_records(self, pdf_path: str,
+                              page_numbers: Optional[List[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Extract page records from scratch: text layer (or OCR text) and stored image references"""
+        pages = self.iter_pdf_pages(pdf_path, page_numbers, store_images=True)
+        for page, ocr_text in self._with_ocr_text(pdf_path, pages):
+            yield {
+                "page": page.page,
+                "text": page.text if ocr_text is None else ocr_text,
+                "ocr": ocr_text is not None,
+                "images": [{"page": ref.page, "index": ref.index, "id": ref.id, "format": "png"}
+                           for ref in page.images if ref.id is not None]
+            }
+    
+    def _load_pdf_file_pages(self, file_hash: str, page_count: int) -> Optional[List[str]]:
+        """Page hashes recorded for a previously seen PDF file, or None"""
+        rows = self.db.connection().execute(
+            'SELECT page_hash FROM pdf_files WHERE file_hash = ? ORDER BY page', (file_hash,)
+        ).fetchall()
+        return [row[0] for row in rows] if len(rows) == page_count else None
+    
+    def _load_pdf_pages(self, page_hashes: set) -> Dict[str, Dict[str, Any]]:
+        """Cached page records by page hash.
+        
+        Records whose images have left the image store are skipped, as are pages that needed
+        OCR but were cached without it (Tesseract missing or failing), so they are retried.
+        """
+        min_text_chars = self.config["ocr"]["min_text_chars"]
+        conn = self.db.connection()
+        hashes = list(page_hashes)
+        cached = {}
+        for start in range(0, len(hashes), 500):  # stay under SQLite's bound-parameter limit
+            batch = hashes[start:start + 500]
+            rows = conn.execute(
+                f'SELECT page_hash, text, ocr, images FROM pdf_pages WHERE page_hash IN ({",".join("?" * len(batch))})',
+                batch
+            ).fetchall()
+            for page_hash, text, ocr, images in rows:
+                if TESSERACT_AVAILABLE and not ocr and len(text.strip()) < min_text_chars:
+                    continue
+                images = json.loads(images)
+                if all(self.image_store.has(image["id"]) for image in images):
+                    cached[page_hash] = {"text": text, "ocr": bool(ocr), "images": images}
+        return cached
+    
+    def _store_pdf_pages(self, file_hash: str, page_hashes: List[str], new_pages: Dict[str, Dict[str, Any]],
+                         name: Optional[str] = None):
+        """Save newly extracted page records and the file's page hashes and name in one transaction"""
+        cached_at = datetime.now().isoformat()
+        with self.db.transaction() as cursor:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete skips the full-text index triggers
+            cursor.executemany('''
+                INSERT INTO pdf_pages (page_hash, text, ocr, images, cached_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (page_hash) DO UPDATE SET
+                    text = excluded.text, ocr = excluded.ocr, images = excluded.images, cached_at = excluded.cached_at
+            ''', [(page_hash, record["text"], int(record["ocr"]), json.dumps(record["images"]), cached_at)
+                  for page_hash, record in new_pages.items()])
+            cursor.executemany(
+                'INSERT OR REPLACE INTO pdf_files (file_hash, page, page_hash, name) VALUES (?, ?, ?, ?)',
+                [(file_hash, page_num, page_hash, name) for page_num, page_hash in enumerate(page_hashes, start=1)]
+            )
+    
+    def _with_ocr_text(self, pdf_path: str, pages: Iterator[PdfPage]) -> Iterator[Tuple[PdfPage, Optional[str]]]:
+        """Pair each page with its OCR text, or None if it already has a text layer, keeping page order.
+        
+        Pages with fewer than ocr.min_text_chars characters of text are OCR'd one page per
+        task on the worker process pool. At most ocr.max_pages_in_memory pages are in flight,
+        so no more than that many pages are rendered at once.
+        """
+        ocr_config = self.config["ocr"]
+        if not TESSERACT_AVAILABLE:
+            for page in pages:
+                yield page, None
+            return
+        
+        max_workers = self.config["pdf"]["max_workers"] or os.cpu_count() or 1
+        pool = self._get_process_pool() if max_workers > 1 else None
+        max_in_flight = max(1, ocr_config["max_pages_in_memory"])
+        pending = deque()
+        
+        def next_ready() -> Tuple[PdfPage, Optional[str]]:
+            page, future = pending.popleft()
+            if future is None:
+                return page, None
+            try:
+                return page, future.result()
+            except Exception as e:
+                logger.warning(f"OCR failed for page {page.page} of {pdf_path}: {e}")
+                return page, None
+        
+        for page in pages:
+            if len(pending) >= max_in_flight:
+                yield next_ready()
+            future = None
+            if len(page.text.strip()) < ocr_config["min_text_chars"]:
+                if pool is not None:
+                    future = pool.submit(_ocr_pdf_page, pdf_path, page.page, ocr_config)
+                else:
+                    future = Future()
+                    try:
+                        future.set_result(_ocr_pdf_page(pdf_path, page.page, ocr_config))
+                    except Exception as e:
+                        future.set_exception(e)
+            pending.append((page, future))
+        while pending:
+            yield next_ready()
+    
+    def save_upload(self, stream, directory: Optional[str] = None, prefix: str = "upload_") -> Path:
+        """Copy an upload stream to a new uniquely named .pdf file in fixed-size chunks.
+        
+        Raises ValueError once the upload exceeds uploads.max_size_mb, removing the
+        partial file. Concurrent uploads never share a file, and at most one chunk of
+        the upload is held in memory.
+        """
+        upload_config = self.config["uploads"]
+        max_bytes = int(upload_config["max_size_mb"] * 1024 * 1024)
+        chunk_size = int(upload_config["chunk_size_kb"] * 1024)
+        directory = directory or upload_config["temp_dir"] or None
+        
+        fd, path = tempfile.mkstemp(suffix=".pdf", prefix=prefix, dir=directory)
+        written = 0
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in iter(lambda: stream.read(chunk_size), b''):
+                    written += len(chunk)
+                    if written > max_bytes:
+                        raise ValueError(f"Upload exceeds the {upload_config['max_size_mb']} MB limit")
+                    f.write(chunk)
+        except BaseException:
+            Path(path).unlink(missing_ok=True)
+            raise
+        return Path(path)
+    
+    def process_uploaded_pdf(self, pdf_file) -> Iterator[Dict[str, Any]]:
+        """Process an uploaded PDF file, returning an iterator over its extracted content.
+        
+        pdf_file is an uploaded file (anything with a .stream) or a readable binary stream.
+        The upload is saved before this returns, so a ValueError for an oversized upload is
+        raised here rather than mid-iteration. The iterator yields a {"type": "document"}
+        record with the page count, one {"type": "page"} record per page, then a
+        {"type": "done"} summary, so memory use doesn't grow with the length of the document.
+        An uploaded file's own name is recorded as the document name for search hits.
+        """
+        # Spool the upload to its own temporary file; PDFs keep their page index at the end
+        temp_path = self.save_upload(getattr(pdf_file, "stream", pdf_file))
+        name = os.path.basename(getattr(pdf_file, "filename", None) or "") or None
+        return self._iter_upload_records(temp_path, name)
+    
+    def _iter_upload_records(self, temp_path: Path, name: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the records for a saved upload, deleting the file afterwards"""
+        try:
+            with fitz.open(str(temp_path)) as doc:
+                page_count = len(doc)
+            yield {"type": "document", "page_count": page_count}
+            
+            image_count = 0
+            for page in self.iter_extracted_pdf_pages(str(temp_path), name):
+                image_count += len(page["images"])
+                yield dict(type="page", **page)
+            
+            yield {"type": "done", "page_count": page_count, "image_count": image_count}
             
         except Exception as e:
             logger.error(f"Error processing uploaded PDF: {e}")
             raise
+        finally:
+            # Clean up temp file
+            temp_path.unlink(missing_ok=True)
 
-def main():
-    """Main function to demonstrate the app"""
-    print("=== Novel Rewrite Research Automation App (Fixed Version) ===\n")
+@dataclass
+class ResearchJob:
+    """Represents a research workflow run submitted to the job queue"""
+    id: str
+    topic: str
+    context: str
+    keywords: List[str]
+    options: Dict[str, Any]
+    metadata: Dict[str, Any]
+    status: str  # queued, running, done or failed
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+class ResearchJobQueue:
+    """Runs research workflows on a local worker pool, with job state persisted in SQLite"""
     
-    # Initialize the app
-    app = NovelRewriteApp()
+    # Progress events are kept in memory for this many recent jobs
+    MAX_EVENT_LOGS = 200
+    TERMINAL_EVENTS = ("job_done", "job_failed")
     
-    # Example usage with real research topics
-    topics = [
-        "Venus colonization technology",
-        "Interplanetary radio communication",
-        "Space habitat design principles"
-    ]
+    def __init__(self, app: NovelRewriteApp, max_workers: int = 2, lease_seconds: float = 60.0):
+        self.app = app
+        self.max_workers = max_workers
+        # A running job is leased to the process that claimed it, which renews the lease while
+        # it runs; only jobs whose lease has expired are taken over by another process
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._heartbeat_stop = threading.Event()
+        self._started = False
+        self._lock = threading.Lock()
+        self._events: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._events_changed = threading.Condition()
     
-    for topic in topics:
-        print(f"\n--- Researching: {topic} ---")
-        try:
-            synthesis = app.run_research_workflow(
-                topic=topic,
-                context="for science fiction novel research",
-                keywords=["technology", "future", "space"]
-            )
+    def _ensure_started(self):
+        """Start the worker pool on first use and resume jobs left over from a previous run"""
+        if self._started:
+            return
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="research-job")
+            
+            threading.Thread(target=self._renew_leases, name="research-job-lease", daemon=True).start()
             
-            print(f"✓ Completed research for: {topic}")
-            print(f"  Sources found: {synthesis['total_sources']}")
-            print(f"  Key facts extracted: {len(synthesis['key_facts'])}")
-            print(f"  Summary: {synthesis['summary'][:100]}...")
+            # Jobs whose process stopped without finishing them start over; jobs another live
+            # process is still running keep renewing their lease and are left alone
+            with self.app.db.transaction() as cursor:
+                cursor.execute("UPDATE research_jobs SET status = 'queued', started_at = NULL, owner = NULL "
+                               "WHERE status = 'running' AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                               (time.time() - self.lease_seconds,))
+                cursor.execute("SELECT id FROM research_jobs WHERE status = 'queued' ORDER BY created_at")
+                pending = [row[0] for row in cursor.fetchall()]
             
+            for job_id in pending:
+                self._executor.submit(self._run, job_id)
+            if pending:
+                logger.info(f"Resumed {len(pending)} queued research jobs")
+    
+    def submit(self, topic: str, context: str = "", keywords: List[str] = None,
+               options: Dict[str, Any] = None, metadata: Dict[str, Any] = None) -> str:
+        """Queue a research workflow and return its job id"""
+        self._ensure_started()
+        job_id = uuid.uuid4().hex
+        
+        with self.app.db.transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO research_jobs
+                (id, topic, context, keywords, options, metadata, status, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, 'queued', ?)
+            ''', (job_id, topic, context, json.dumps(keywords or []), json.dumps(options or {}),
+                  json.dumps(metadata or {}), datetime.now().isoformat()))
+        
+        self._executor.submit(self._run, job_id)
+        logger.info(f"Queued research job {job_id} for topic: {topic}")
+        return job_id
+    
+    def get(self, job_id: str) -> Optional[ResearchJob]:
+        """Load a job's current state"""
+        self._ensure_started()
+        row = self.app.db.connection().execute('''
+            SELECT id, topic, context, keywords, options, metadata, status, created_at,
+                   started_at, finished_at, result, error
+            FROM research_jobs WHERE id = ?
+        ''', (job_id,)).fetchone()
+        if row is None:
+            return None
+        
+        return ResearchJob(
+            id=row[0],
+            topic=row[1],
+            context=row[2] or "",
+            keywords=json.loads(row[3] or "[]"),
+            options=json.loads(row[4] or "{}"),
+            metadata=json.loads(row[5] or "{}"),
+            status=row[6],
+            created_at=row[7],
+            started_at=row[8],
+            finished_at=row[9],
+            result=json.loads(row[10]) if row[10] else None,
+            error=row[11]
+        )
+    
+    def _run(self, job_id: str):
+        """Worker: run one queued job and record its outcome"""
+        # Claim the job atomically so it never runs twice
+        with self.app.db.transaction() as cursor:
+            cursor.execute("UPDATE research_jobs SET status = 'running', started_at = ?, owner = ?, heartbeat_at = ? "
+                           "WHERE id = ? AND status = 'queued'",
+                           (datetime.now().isoformat(), self.owner, time.time(), job_id))
+            claimed = cursor.rowcount == 1
+        if not claimed:
+            return
+        job = self.get(job_id)
+        self._publish(job_id, {"event": "job_started", "topic": job.topic})
+        
+        try:
+            synthesis = self.app.run_research_workflow(
+                job.topic, job.context, job.keywords,
+                progress=lambda event: self._publish(job_id, event),
+                **job.options
+            )
+            status, result, error = 'done', json.dumps(synthesis), None
         except Exception as e:
-            print(f"✗ Error researching {topic}: {e}")
+            logger.error(f"Research job {job_id} failed: {e}", exc_info=True)
+            status, result, error = 'failed', None, str(e)
+        
+        with self.app.db.transaction() as cursor:
+            cursor.execute('''
+                UPDATE research_jobs SET status = ?, result = ?, error = ?, finished_at = ?
+                WHERE id = ?
+            ''', (status, result, error, datetime.now().isoformat(), job_id))
+        logger.info(f"Research job {job_id} finished with status: {status}")
+        self._publish(job_id, {"event": f"job_{status}", "error": error})
+    
+    def _renew_leases(self):
+        """Background thread: keep extending the leases of the jobs this process is running"""
+        while not self._heartbeat_stop.wait(self.lease_seconds / 3):
+            try:
+                with self.app.db.transaction() as cursor:
+                    cursor.execute("UPDATE research_jobs SET heartbeat_at = ? WHERE status = 'running' AND owner = ?",
+                                   (time.time(), self.owner))
+            except sqlite3.Error as e:
+                logger.warning(f"Could not renew research job leases: {e}")
+    
+    def _publish(self, job_id: str, event: Dict[str, Any]):
+        """Append a progress event to a job's log and wake up anyone streaming it"""
+        with self._events_changed:
+            log = self._events.setdefault(job_id, [])
+            log.append(event)
+            self._events.move_to_end(job_id)
+            while len(self._events) > self.MAX_EVENT_LOGS:
+                self._events.popitem(last=False)
+            self._events_changed.notify_all()
+    
+    def iter_events(self, job_id: str, heartbeat: float = 15.0) -> Iterator[Optional[Dict[str, Any]]]:
+        """Yield a job's progress events as they happen, ending after it finishes.
+        
+        Yields None every `heartbeat` seconds without news so streams can send keep-alives.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return
+        
+        # Jobs finished before this process started have no event log, only their final state
+        if job.status in ('done', 'failed') and job_id not in self._events:
+            yield {"event": f"job_{job.status}", "error": job.error}
+            return
+        
+        sent = 0
+        while True:
+            with self._events_changed:
+                log = self._events.get(job_id, [])
+                if sent >= len(log):
+                    self._events_changed.wait(timeout=heartbeat)
+                    log = self._events.get(job_id, [])
+                pending = log[sent:]
+                sent = len(log)
+            
+            if not pending:
+                yield None
+                continue
+            for event in pending:
+                yield event
+                if event["event"] in self.TERMINAL_EVENTS:
+                    return
+    
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work; queued jobs stay in the database for the next start"""
+        with self._lock:
+            executor = self._executor
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+        self._heartbeat_stop.set()
+
+def main(argv: Optional[List[str]] = None):
+    """Research topics from the command line (the example topics if none are given) as one batch"""
+    parser = argparse.ArgumentParser(description="Research topics for a novel rewrite")
+    parser.add_argument("topics", nargs="*", help="topics to research")
+    parser.add_argument("--topics-file", help="file with one topic per line")
+    parser.add_argument("--context", default="for science fiction novel research")
+    parser.add_argument("--keywords", default="technology,future,space", help="comma-separated keywords")
+    parser.add_argument("--refresh", action="store_true", help="skip cached searches and the local corpus")
+    parser.add_argument("--incremental", action="store_true",
+                        help="re-extract only new or changed pages and update each topic's results file in place")
+    args = parser.parse_args(argv)
+    
+    topics = list(args.topics)
+    if args.topics_file:
+        topics += [line.strip() for line in Path(args.topics_file).read_text(encoding="utf-8").splitlines()
+                   if line.strip()]
+    if not topics:
+        # Example usage with real research topics
+        topics = [
+            "Venus colonization technology",
+            "Interplanetary radio communication",
+            "Space habitat design principles"
+        ]
+    keywords = [keyword.strip() for keyword in args.keywords.split(",") if keyword.strip()]
+    
+    print("=== Novel Rewrite Research Automation App (Fixed Version) ===\n")
+    
+    # Initialize the app
+    app = NovelRewriteApp()
+    options = {"use_search_cache": False, "use_local_corpus": False} if args.refresh else {}
+    options["incremental"] = args.incremental
+    
+    print(f"Researching {len(topics)} topics...")
+    for synthesis in app.run_research_batch(topics, context=args.context, keywords=keywords, **options):
+        topic = synthesis["topic"]
+        print(f"\n--- Researching: {topic} ---")
+        if "error" in synthesis:
+            print(f"✗ Error researching {topic}: {synthesis['error']}")
+            continue
+        
+        print(f"✓ Completed research for: {topic}")
+        print(f"  Sources found: {synthesis['total_sources']}")
+        print(f"  Key facts extracted: {len(synthesis['key_facts'])}")
+        print(f"  Summary: {synthesis['summary'][:100]}...")
     
+    app.close()
     print("\n=== Research Complete ===")
     print("Check the 'research_results' directory for output files.")
     print("\nTo get better results, consider:")
@@ -110,6 +110,236 @@ def test_flask_routes():
         print(f"✗ Error testing Flask routes: {e}")
         return False
 
+def _make_sample_pdf(path, page_count):
+    """Write a small PDF with numbered text pages and a few embedded images"""
+    import io
+    import fitz
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 30), (200, 30, 30)).save(buffer, "PNG")
+    doc = fitz.open()
+    for page_num in range(page_count):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {page_num + 1}: Venus cloud cities float at 50 km.")
+        if page_num % 5 == 0:
+            page.insert_image(fitz.Rect(72, 100, 112, 130), stream=buffer.getvalue())
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+def test_parallel_pdf_extraction_matches_serial(tmp_path, monkeypatch):
+    """Splitting pages across worker processes gives the same result as a serial pass"""
+    monkeypatch.chdir(tmp_path)
+    pdf_path = _make_sample_pdf(tmp_path / "book.pdf", 40)
+    app = NovelRewriteApp()
+
+    app.config["pdf"].update({"max_workers": 1})
+    serial = app.extract_pdf_text_and_images(pdf_path)
+    app.config["pdf"].update({"max_workers": 3, "parallel_min_pages": 10, "min_pages_per_task": 4})
+    parallel = app.extract_pdf_text_and_images(pdf_path)
+    app.close()
+
+    assert parallel == serial
+    assert serial["page_count"] == 40
+    assert len(serial["images"]) == 8
+    assert serial["text"].index("Page 9:") < serial["text"].index("Page 10:")
+
+def test_process_uploaded_pdf_streams_pages(tmp_path, monkeypatch):
+    """Uploaded PDFs are yielded page by page, with images saved to the image store"""
+    monkeypatch.chdir(tmp_path)
+    pdf_path = _make_sample_pdf(tmp_path / "book.pdf", 12)
+    app = NovelRewriteApp()
+    (tmp_path / "spool").mkdir()
+    app.config["uploads"].update({"temp_dir": str(tmp_path / "spool"), "chunk_size_kb": 4})
+
+    with open(pdf_path, "rb") as upload:
+        records = list(app.process_uploaded_pdf(upload))
+    first_page = next(app.iter_pdf_pages(pdf_path))
+    app.close()
+
+    assert records[0] == {"type": "document", "page_count": 12}
+    assert [r["page"] for r in records if r["type"] == "page"] == list(range(1, 13))
+    assert records[-1] == {"type": "done", "page_count": 12, "image_count": 3}
+    # The image repeated on three pages is stored once and referenced by its content hash
+    image_ids = {image["id"] for r in records if r["type"] == "page" for image in r["images"]}
+    assert len(image_ids) == 1
+    assert app.image_store.get(image_ids.pop()).startswith(b"\x89PNG")
+    assert len(list(Path("pdf_images").rglob("*.png"))) == 1
+    assert list((tmp_path / "spool").iterdir()) == []
+    assert first_page.images[0].to_png().startswith(b"\x89PNG")
+
+def test_save_upload_uses_unique_files_and_enforces_limit(tmp_path, monkeypatch):
+    """Each upload gets its own file, and oversized uploads are rejected without leftovers"""
+    import io
+
+    monkeypatch.chdir(tmp_path)
+    app = NovelRewriteApp()
+    app.config["uploads"].update({"max_size_mb": 0.01, "chunk_size_kb": 1})
+
+    first = app.pdf.save_upload(io.BytesIO(b"%PDF-1.4 a"), directory=str(tmp_path))
+    second = app.pdf.save_upload(io.BytesIO(b"%PDF-1.4 b"), directory=str(tmp_path))
+    try:
+        app.pdf.save_upload(io.BytesIO(b"x" * 20000), directory=str(tmp_path))
+        raise AssertionError("oversized upload was accepted")
+    except ValueError as e:
+        assert "limit" in str(e)
+    app.close()
+
+    assert first != second
+    assert (first.read_bytes(), second.read_bytes()) == (b"%PDF-1.4 a", b"%PDF-1.4 b")
+    assert sorted(tmp_path.glob("*.pdf")) == sorted([first, second])
+
+def test_page_renders_follow_ocr_config(tmp_path, monkeypatch):
+    """Page ranges render lazily at the configured DPI and color mode"""
+    monkeypatch.chdir(tmp_path)
+    pdf_path = _make_sample_pdf(tmp_path / "book.pdf", 10)
+    app = NovelRewriteApp()
+    app.config["ocr"].update({"dpi": 72, "grayscale": True})
+
+    renders = app.iter_page_renders(pdf_path, first_page=3, last_page=5)
+    page_num, image = next(renders)
+    assert page_num == 3
+    assert (image.mode, image.size) == ("L", (595, 842))
+    assert [page_num for page_num, _ in renders] == [4, 5]
+
+    app.config["ocr"].update({"dpi": 144, "grayscale": False})
+    image = app.convert_pdf_to_images(pdf_path, first_page=10)[0]
+    app.close()
+    assert (image.mode, image.size) == ("RGB", (1190, 1684))
+
+def test_ocr_runs_only_on_pages_without_text(tmp_path, monkeypatch):
+    """Pages without a text layer are OCR'd in page order; pages with text are left alone"""
+    import fitz
+    import novel_rewrite_app
+
+    monkeypatch.chdir(tmp_path)
+    doc = fitz.open()
+    for page_num in range(4):
+        page = doc.new_page()
+        if page_num % 2 == 0:
+            page.insert_text((72, 72), f"Page {page_num + 1}: " + "Venus cloud cities float at 50 km. " * 4)
+    doc.save(str(tmp_path / "scan.pdf"))
+    doc.close()
+
+    ocr_calls = []
+    def fake_tesseract(image, lang):
+        ocr_calls.append((image.mode, lang))
+        return f"OCR text {len(ocr_calls)}"
+    monkeypatch.setattr(novel_rewrite_app, "TESSERACT_AVAILABLE", True)
+    monkeypatch.setattr(novel_rewrite_app.pytesseract, "image_to_string", fake_tesseract)
+
+    app = NovelRewriteApp()
+    app.config["pdf"]["max_workers"] = 1
+    app.config["ocr"]["dpi"] = 72
+    extracted = app.extract_pdf_text_and_images(str(tmp_path / "scan.pdf"))
+    app.close()
+
+    assert extracted["ocr_pages"] == [2, 4]
+    assert ocr_calls == [("L", "eng"), ("L", "eng")]
+    assert "--- Page 2 ---\nOCR text 1" in extracted["text"]
+    assert "--- Page 4 ---\nOCR text 2" in extracted["text"]
+    assert "Page 3: Venus" in extracted["text"]
+
+def test_pdf_page_cache_reprocesses_only_changed_pages(tmp_path, monkeypatch):
+    """Re-extracting a PDF uses cached pages; a revised file only re-extracts changed pages"""
+    import fitz
+    import novel_rewrite_app
+
+    monkeypatch.chdir(tmp_path)
+    pdf_path = _make_sample_pdf(tmp_path / "book.pdf", 6)
+    extracted_pages = []
+    real_iter = novel_rewrite_app._iter_pdf_page_list
+    def spy(path, page_numbers, *args):
+        extracted_pages.append(list(page_numbers))
+        return real_iter(path, page_numbers, *args)
+    monkeypatch.setattr(novel_rewrite_app, "_iter_pdf_page_list", spy)
+
+    app = NovelRewriteApp()
+    app.config["pdf"]["max_workers"] = 1
+    first = app.extract_pdf_text_and_images(pdf_path)
+    second = app.extract_pdf_text_and_images(pdf_path)
+
+    doc = fitz.open(pdf_path)
+    doc[2].insert_text((72, 200), "Revised: the habitat now floats at 55 km.")
+    doc.save(str(tmp_path / "revised.pdf"))
+    doc.close()
+    revised = app.extract_pdf_text_and_images(str(tmp_path / "revised.pdf"))
+    app.close()
+
+    assert extracted_pages == [[1, 2, 3, 4, 5, 6], [3]]
+    assert second == first
+    assert revised["images"] == first["images"]
+    assert "Revised: the habitat" in revised["text"]
+
+def test_pdf_page_hash_covers_fonts(tmp_path):
+    """Changing only a font's ToUnicode map (and so the extracted text) changes the page hash"""
+    import fitz
+    from novel_rewrite_app import _pdf_page_hash
+
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_font(fontname="F1", fontbuffer=fitz.Font("cour").buffer)
+    page.insert_text((72, 72), "Venus", fontname="F1")
+    doc.save(str(tmp_path / "font.pdf"))
+    doc.close()
+
+    with fitz.open(str(tmp_path / "font.pdf")) as doc:
+        to_unicode = int(doc.xref_get_key(doc[0].get_fonts()[0][0], "ToUnicode")[1].split()[0])
+        cmap = doc.xref_stream(to_unicode)
+        doc.update_stream(to_unicode, cmap.replace(b"<0009> <0040> <0028>", b"<0009> <0040> <0029>"))
+        doc.save(str(tmp_path / "remapped.pdf"))
+
+    def read(name):
+        with fitz.open(str(tmp_path / name)) as doc:
+            return _pdf_page_hash(doc, doc[0], "pymupdf"), doc[0].read_contents(), doc[0].get_text().strip()
+
+    (before_hash, before_contents, before_text), (after_hash, after_contents, after_text) = map(
+        read, ["font.pdf", "remapped.pdf"])
+    assert after_contents == before_contents and (before_text, after_text) == ("Venus", "Wenus")
+    assert after_hash != before_hash
+
+def test_pdf_page_cache_tells_form_xobject_pages_apart(tmp_path, monkeypatch):
+    """Pages whose content only draws a form XObject are hashed by what the form draws"""
+    import fitz
+    from novel_rewrite_app import _pdf_page_hash
+
+    monkeypatch.chdir(tmp_path)
+    source = fitz.open()
+    for text in ["Alpha chapter text here.", "Beta chapter text here."]:
+        source.new_page().insert_text((72, 72), text)
+    doc = fitz.open()
+    for page_num in range(2):
+        page = doc.new_page()
+        page.show_pdf_page(page.rect, source, page_num)
+    doc.save(str(tmp_path / "forms.pdf"))
+    doc.close()
+
+    with fitz.open(str(tmp_path / "forms.pdf")) as doc:
+        assert doc[0].read_contents() == doc[1].read_contents()
+        assert _pdf_page_hash(doc, doc[0], "pymupdf") != _pdf_page_hash(doc, doc[1], "pymupdf")
+
+    app = NovelRewriteApp()
+    app.config["pdf"]["max_workers"] = 1
+    first = app.extract_pdf_text_and_images(str(tmp_path / "forms.pdf"))
+    second = app.extract_pdf_text_and_images(str(tmp_path / "forms.pdf"))
+    app.close()
+
+    assert second == first
+    assert "Page 1 ---\nAlpha chapter" in first["text"] and "Page 2 ---\nBeta chapter" in first["text"]
+
+def test_pdf_text_engines_agree(tmp_path):
+    """Every installed PDF text engine reads the same page text"""
+    from novel_rewrite_app import available_pdf_engines, extract_pdf_text
+
+    pdf_path = _make_sample_pdf(tmp_path / "book.pdf", 3)
+
+    outputs = {engine: [" ".join(text.split()) for text in extract_pdf_text(pdf_path, engine)]
+               for engine in available_pdf_engines()}
+
+    assert all(pages == outputs["pymupdf"] for pages in outputs.values())
+    assert outputs["pymupdf"][2] == "Page 3: Venus cloud cities float at 50 km."
+
 def main():
     """Main test function"""
     print("Novel Rewrite App - PDF Functionality Test")
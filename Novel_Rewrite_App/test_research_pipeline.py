@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Tests for the research pipeline in Novel Rewrite App (no network access)
+"""
+
+import gc
+import json
+import os
+import sys
+import threading
+import time
+import numpy as np
+from datetime import datetime
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from novel_rewrite_app import (NovelRewriteApp, SearchResult, ExtractedInfo, DomainThrottle, HttpClient,
+                               ResearchJobQueue, available_html_parsers, cluster_near_duplicates, parse_html,
+                               rank_sentences, segment_sentences, summarize_documents, tfidf_matrix)
+
+
+def _make_app(tmp_path, monkeypatch):
+    """Create an app whose database and output live in a temporary directory"""
+    monkeypatch.chdir(tmp_path)
+    return NovelRewriteApp()
+
+
+def _make_result(url: str) -> SearchResult:
+    return SearchResult(title=url, url=url, snippet="", source="test",
+                        relevance_score=0.8, domain=url.split('/')[2])
+
+
+def test_domain_throttle_spaces_same_host_only():
+    """Same-host slots are spaced by the delay, other hosts are not"""
+    throttle = DomainThrottle(delay=0.2)
+    starts = []
+    for domain in ["a.example", "b.example", "a.example"]:
+        with throttle.slot(domain):
+            starts.append(time.monotonic())
+
+    assert starts[1] - starts[0] < 0.1
+    assert starts[2] - starts[0] >= 0.19
+
+
+def test_extract_information_keeps_ranking_order(tmp_path, monkeypatch):
+    """Concurrent extraction reports pages as they finish but returns them in ranking order"""
+    app = _make_app(tmp_path, monkeypatch)
+    app.config["extraction"]["max_workers"] = 5
+    results = [_make_result(f"https://host{i}.example/page") for i in range(5)]
+
+    def fake_extract(url, previous=None):
+        # Later-ranked pages finish first
+        time.sleep(0.05 * (5 - int(url[12])))
+        return ExtractedInfo(url=url, title=url, content="text", key_facts=[],
+                             summary="", extracted_at=datetime.now().isoformat(), word_count=1)
+
+    saved = []
+    monkeypatch.setattr(app, "_extract_from_url", fake_extract)
+    monkeypatch.setattr(app, "_save_extracted_info",
+                        lambda pairs: saved.extend(info.url for result, info in pairs))
+
+    events = []
+    extracted = app.extract_information(results, progress=events.append)
+
+    assert [info.url for info in extracted] == [result.url for result in results]
+    assert saved == [result.url for result in results]
+    # Progress is reported in completion order, before the slowest page is done
+    assert [event["rank"] for event in events] == [5, 4, 3, 2, 1]
+
+
+class _FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.url = "https://example.com/page"
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+def test_fetch_page_uses_response_cache(tmp_path, monkeypatch):
+    """Fresh entries skip the network, stale ones are revalidated with their ETag"""
+    app = _make_app(tmp_path, monkeypatch)
+    requests_seen = []
+
+    def fake_get(url, headers=None, **kwargs):
+        requests_seen.append(headers or {})
+        if headers and headers.get('If-None-Match') == '"v1"':
+            return _FakeResponse(304)
+        return _FakeResponse(200, b"<html>venus</html>", {'ETag': '"v1"', 'Content-Type': 'text/html'})
+
+    monkeypatch.setattr(app.http, "get", fake_get)
+    url = "https://Example.com:443/page?b=2&a=1#top"
+
+    assert app._fetch_page(url) == b"<html>venus</html>"
+    assert app._fetch_page("https://example.com/page?a=1&b=2") == b"<html>venus</html>"
+    assert len(requests_seen) == 1
+
+    assert app._fetch_page(url, revalidate=True) == b"<html>venus</html>"
+    assert requests_seen[-1]['If-None-Match'] == '"v1"'
+
+    app.response_cache.ttl_seconds = 0
+    assert app._fetch_page(url) == b"<html>venus</html>"
+    assert requests_seen[-1]['If-None-Match'] == '"v1"'
+    assert app.response_cache.snapshot() == {"hits": 1, "revalidated": 2, "misses": 1}
+
+
+def test_http_client_pools_by_host_and_carries_search_and_extraction(tmp_path, monkeypatch):
+    """Configured hosts get their own retrying pool, and searches and page fetches share one session"""
+    app = _make_app(tmp_path, monkeypatch)
+    app.response_cache = None
+    http_config = app.config["http"]
+    app.http.close()
+    app.http = HttpClient(dict(http_config, host_pool_maxsize={"www.googleapis.com": 4}))
+
+    google = app.http.session.get_adapter("https://www.googleapis.com/customsearch/v1?q=venus")
+    default = app.http.session.get_adapter("https://venus.example/cities")
+    assert google is not default
+    assert google.poolmanager.connection_pool_kw["maxsize"] == 4
+    assert default.poolmanager.connection_pool_kw["maxsize"] == http_config["pool_maxsize"]
+    assert google.max_retries.total == default.max_retries.total == http_config["max_retries"]
+    assert list(google.max_retries.status_forcelist) == http_config["retry_status_codes"]
+
+    requests_seen = []
+
+    def fake_get(url, **kwargs):
+        requests_seen.append((url, kwargs["timeout"]))
+        if "duckduckgo" in url:
+            return _FakeResponse(200, b'{"Abstract": "Cloud cities", "AbstractURL": "https://venus.example/cities"}')
+        return _FakeResponse(200, b"<html><title>Cities</title><p>Aerostats float at 50 km.</p></html>",
+                             {"Content-Type": "text/html"})
+
+    monkeypatch.setattr(app.http.session, "get", fake_get)
+    results = app._duckduckgo_search(app.formulate_query("Venus floating cities"))
+    extracted = app.extract_information(results)
+
+    assert [url for url, _ in requests_seen] == ["https://api.duckduckgo.com/", "https://venus.example/cities"]
+    assert {timeout for _, timeout in requests_seen} == {app.http.timeout}
+    assert [info.title for info in extracted] == ["Cities"]
+
+
+def test_execute_search_reuses_cached_results(tmp_path, monkeypatch):
+    """The same formulated query hits the search engine only once unless the cache is bypassed"""
+    app = _make_app(tmp_path, monkeypatch)
+    calls = []
+
+    def fake_duckduckgo(query):
+        calls.append(query.query_text)
+        return [_make_result("https://venus.example/cities")]
+
+    monkeypatch.setattr(app, "_duckduckgo_search", fake_duckduckgo)
+    query = app.formulate_query("Venus floating cities")
+
+    first = app.execute_search(query)
+    second = app.execute_search(query)
+    app.execute_search(query, use_cache=False)
+
+    assert [r.url for r in first] == [r.url for r in second] == ["https://venus.example/cities"]
+    assert len(calls) == 2
+
+
+def test_saved_rows_link_to_their_own_parents(tmp_path, monkeypatch):
+    """Row ids are propagated, so repeated query text never attaches rows to an older query"""
+    app = _make_app(tmp_path, monkeypatch)
+    first = app.formulate_query("Venus floating cities")
+    second = app.formulate_query("Venus floating cities")
+    results = [_make_result("https://venus.example/a"), _make_result("https://venus.example/b")]
+
+    app._save_search_results(second, results)
+    info = ExtractedInfo(url=results[1].url, title="b", content="text", key_facts=[],
+                         summary="", extracted_at=datetime.now().isoformat(), word_count=1)
+    app._save_extracted_info([(results[1], info)])
+
+    conn = app.db.connection()
+    assert first.id != second.id
+    assert conn.execute('SELECT query_id, url FROM search_results ORDER BY id').fetchall() == [
+        (second.id, results[0].url), (second.id, results[1].url)]
+    assert conn.execute('SELECT result_id FROM extracted_info').fetchall() == [(results[1].id,)]
+    assert conn.execute('PRAGMA user_version').fetchone()[0] == len(app.SCHEMA_MIGRATIONS)
+
+
+def test_database_closes_connections_of_finished_threads(tmp_path, monkeypatch):
+    """Short-lived request threads don't leave their SQLite connections open"""
+    app = _make_app(tmp_path, monkeypatch)
+    app.db.connection()
+
+    for _ in range(20):
+        thread = threading.Thread(target=lambda: app.db.connection().execute('SELECT 1').fetchone())
+        thread.start()
+        thread.join()
+    del thread
+    gc.collect()
+
+    assert len(app.db._connections) == 1
+
+
+def test_fetch_page_caps_download_and_rejects_non_html(tmp_path, monkeypatch):
+    """Bodies stop at the byte budget and non-HTML content types are never downloaded"""
+    app = _make_app(tmp_path, monkeypatch)
+    app.response_cache = None
+    app.config["extraction"]["max_download_bytes"] = 1000
+    responses = {
+        "https://big.example/": _FakeResponse(200, b"x" * 50000, {'Content-Type': 'text/html; charset=utf-8'}),
+        "https://zip.example/": _FakeResponse(200, b"PK", {'Content-Type': 'application/zip'}),
+    }
+    monkeypatch.setattr(app.http, "get", lambda url, **kwargs: responses[url])
+
+    assert len(app._fetch_page("https://big.example/")) == 1000
+    assert app._extract_from_url("https://zip.example/") is None
+
+
+def test_html_parser_backends_agree():
+    """Every installed parser backend extracts the same title and main content"""
+    page = (b"<html><head><title> Venus </title><script>var x = 1;</script></head><body>"
+            b"<nav>Home</nav><article><h1>Cloud  cities</h1><p>Floating at 50 km.</p></article></body></html>")
+
+    outputs = {backend: parse_html(page, backend, 5000) for backend in available_html_parsers()}
+    # A tight budget cuts the content, but words are still counted across all of it
+    cut = {backend: parse_html(page, backend, 12) for backend in available_html_parsers()}
+
+    assert set(outputs.values()) == {("Venus", "Cloud cities Floating at 50 km.", 6)}
+    assert set(cut.values()) == {("Venus", "Cloud cities", 6)}
+
+
+def test_job_queue_runs_and_resumes_jobs(tmp_path, monkeypatch):
+    """Jobs run in the background, interrupted jobs survive a restart, and live leases are respected"""
+    app = _make_app(tmp_path, monkeypatch)
+    monkeypatch.setattr(app, "run_research_workflow",
+                        lambda topic, context, keywords, progress=None, **options:
+                        {"topic": topic, "options": options})
+
+    # A job left queued by a previous server process
+    with app.db.transaction() as cursor:
+        cursor.execute("INSERT INTO research_jobs (id, topic, status, created_at) "
+                       "VALUES ('old', 'Venus habitation', 'running', '2025-07-01T00:00:00')")
+        # A job another server process is still running (and renewing the lease of)
+        cursor.execute("INSERT INTO research_jobs (id, topic, status, created_at, owner, heartbeat_at) "
+                       "VALUES ('live', 'Venus clouds', 'running', '2025-07-01T00:00:00', 'other:1', ?)",
+                       (time.time(),))
+
+    queue = ResearchJobQueue(app, max_workers=1)
+    job_id = queue.submit("Venus floating cities", options={"use_search_cache": False})
+    deadline = time.monotonic() + 5
+    while queue.get(job_id).status != "done" and time.monotonic() < deadline:
+        time.sleep(0.05)
+    queue.shutdown()
+
+    assert queue.get("old").status == "done"
+    assert queue.get("live").status == "running"
+    job = queue.get(job_id)
+    assert job.status == "done"
+    assert job.result == {"topic": "Venus floating cities", "options": {"use_search_cache": False}}
+    assert [event["event"] for event in queue.iter_events(job_id)] == ["job_started", "job_done"]
+
+
+def test_search_corpus_ranks_web_and_pdf_text(tmp_path, monkeypatch):
+    """Extracted pages and PDF text are searchable as soon as they are stored, best match first"""
+    app = _make_app(tmp_path, monkeypatch)
+    results = [_make_result("https://venus.example/a"), _make_result("https://venus.example/b")]
+    infos = [
+        ExtractedInfo(url=results[0].url, title="Aerostat habitats", content="Floating habitats drift in the clouds.",
+                      key_facts=[], summary="", extracted_at=datetime.now().isoformat(), word_count=6),
+        ExtractedInfo(url=results[1].url, title="Venus surface", content="The surface is hot. Habitats would melt.",
+                      key_facts=[], summary="", extracted_at=datetime.now().isoformat(), word_count=7),
+    ]
+    app._save_extracted_info(list(zip(results, infos)))
+    app._save_extracted_info([(results[0], infos[0])])  # the same page extracted again
+    app.pdf._store_pdf_pages("file", ["page-0", "page-1"], {page_hash: {
+        "text": f"Chapter {page_hash}: the habitat crew watched sulfuric clouds.", "ocr": False, "images": []}
+        for page_hash in ["page-0", "page-1"]}, name="draft.pdf")
+    app.pdf._store_pdf_pages("other", ["page-1"], {}, name="venus_notes.pdf")
+    with app.db.transaction() as cursor:
+        cursor.execute("DELETE FROM pdf_pages WHERE page_hash = 'page-0'")
+    app.db.connection().execute("VACUUM")  # renumbers implicit rowids, but not INTEGER PRIMARY KEYs
+
+    hits = app.search_corpus("habitats")
+    pdf_hits = app.search_corpus("sulfuric (clouds", sources=("pdf",))
+
+    assert [hit["url"] for hit in hits if hit["source"] == "web"] == [results[0].url, results[1].url]
+    assert "<mark>sulfuric</mark> <mark>clouds</mark>" in pdf_hits[0]["snippet"]
+    assert [(hit["id"], hit["title"], hit["document"]) for hit in pdf_hits] == [
+        ("page-1", "venus_notes.pdf, page 1", "venus_notes.pdf")]
+    assert app.search_corpus("") == []
+
+
+def test_workflow_answers_warm_topics_from_local_corpus(tmp_path, monkeypatch):
+    """Well-covered topics skip search and extraction, thinly covered ones still go to the web"""
+    app = _make_app(tmp_path, monkeypatch)
+    app.config["local_corpus"]["min_sources"] = 2
+    results = [_make_result(f"https://venus.example/{i}") for i in range(3)]
+    app._save_extracted_info([
+        (result, ExtractedInfo(url=result.url, title=f"Venus cloud city {i}", content="Aerostats float at 50 km.",
+                               key_facts=[f"Fact {i}."], summary="", extracted_at=datetime.now().isoformat(),
+                               word_count=4))
+        for i, result in enumerate(results)])
+    searches = []
+    monkeypatch.setattr(app, "execute_search", lambda query, use_cache=True: searches.append(query.topic) or [])
+
+    events = []
+    warm = app.run_research_workflow("Venus cloud city", progress=events.append)
+    cold = app.run_research_workflow("Mars dust storms")
+    app.run_research_workflow("Venus cloud city", use_local_corpus=False)
+
+    assert warm["from_local_corpus"] and warm["total_sources"] == 3
+    assert "local_corpus_hit" in [event["event"] for event in events]
+    assert not cold["from_local_corpus"]
+    assert searches == ["Mars dust storms", "Venus cloud city"]
+
+
+def test_research_batch_fetches_each_url_once(tmp_path, monkeypatch):
+    """Overlapping topics in a batch share fetches, and every topic still gets all its sources"""
+    app = _make_app(tmp_path, monkeypatch)
+    app.config["local_corpus"]["enabled"] = False
+    urls = {
+        "Venus colonization technology": ["https://a.example/venus", "https://b.example/cities"],
+        "Venus floating cities": ["https://b.example/cities", "https://c.example/aerostats"],
+        "Venus clouds": ["https://a.example/venus", "https://B.example:443/cities"],
+    }
+    monkeypatch.setattr(app, "execute_search",
+                        lambda query, use_cache=True: [_make_result(url) for url in urls[query.topic]])
+    fetched = []
+
+    def fake_extract(url, previous=None):
+        fetched.append(url)
+        time.sleep(0.05)
+        return ExtractedInfo(url=url, title=url, content="text", key_facts=[],
+                             summary="", extracted_at=datetime.now().isoformat(), word_count=1)
+
+    monkeypatch.setattr(app, "_extract_from_url", fake_extract)
+    syntheses = app.run_research_batch(list(urls))
+
+    assert [synthesis["topic"] for synthesis in syntheses] == list(urls)
+    assert [synthesis["total_sources"] for synthesis in syntheses] == [2, 2, 2]
+    assert len(fetched) == 3
+
+
+def test_incremental_batch_compares_each_topic_with_its_own_records(tmp_path, monkeypatch):
+    """A URL shared by topics in an incremental batch is unchanged for each topic, not just the first"""
+    app = _make_app(tmp_path, monkeypatch)
+    app.response_cache = None
+    app.config["local_corpus"]["enabled"] = False
+    urls = ["https://shared.example/venus", "https://shared.example/venus.pdf"]
+    topics = ["Venus floating cities", "Venus clouds"]
+    monkeypatch.setattr(app, "_duckduckgo_search", lambda query: [_make_result(url) for url in urls])
+    monkeypatch.setattr(app, "_fetch_page",
+                        lambda url, revalidate=False: b"<html><title>Venus</title><p>Venus has 92 bar.</p></html>")
+
+    for topic in topics:
+        app.run_research_workflow(topic, use_search_cache=False, incremental=True)
+    syntheses = app.run_research_batch(topics, use_search_cache=False, incremental=True)
+
+    assert [synthesis["changed_sources"] for synthesis in syntheses] == [[], []]
+    assert app.db.connection().execute("SELECT COUNT(*) FROM extracted_info").fetchone()[0] == 4
+
+
+def test_incremental_research_reextracts_only_changed_pages(tmp_path, monkeypatch):
+    """Repeat runs parse only new or changed pages and keep one results file per topic"""
+    app = _make_app(tmp_path, monkeypatch)
+    app.response_cache = None
+    pages = {f"https://host{i}.example/venus": f"<html><title>Page {i}</title><p>Venus has 92 bar.</p></html>"
+             for i in range(3)}
+    revalidated = []
+    monkeypatch.setattr(app, "_duckduckgo_search", lambda query: [_make_result(url) for url in pages])
+
+    def fake_fetch(url, revalidate=False):
+        if revalidate:
+            revalidated.append(url)
+        return pages[url].encode()
+
+    monkeypatch.setattr(app, "_fetch_page", fake_fetch)
+
+    def run():
+        events = []
+        synthesis = app.run_research_workflow("Venus floating cities", use_search_cache=False,
+                                              incremental=True, progress=events.append)
+        return synthesis, [event["url"] for event in events
+                           if event["event"] == "page_extracted" and not event["unchanged"]]
+
+    first, first_parsed = run()
+    pages["https://host1.example/venus"] = "<html><title>Page 1</title><p>Venus has 90 bar.</p></html>"
+    second, second_parsed = run()
+    third, third_parsed = run()
+
+    assert len(first_parsed) == 3 and first["total_sources"] == 3
+    assert second_parsed == ["https://host1.example/venus"] and second["total_sources"] == 3
+    assert third_parsed == [] and third["changed_sources"] == []
+    assert sorted(revalidated) == sorted(list(pages) * 2)
+    assert [path.name for path in app.results_dir.iterdir()] == ["Venus_floating_cities.md"]
+    assert app.db.connection().execute("SELECT COUNT(*) FROM extracted_info").fetchone()[0] == 4
+
+
+def test_incremental_research_reports_dropped_pages_once(tmp_path, monkeypatch):
+    """A page that leaves the search results is a change for the next run only, not every run after"""
+    app = _make_app(tmp_path, monkeypatch)
+    app.response_cache = None
+    result_sets = [["a", "b", "c"], ["a", "b", "d"], ["a", "b", "d"], ["a", "b", "d"]]
+    current = []
+    monkeypatch.setattr(app, "_duckduckgo_search",
+                        lambda query: [_make_result(f"https://{name}.example/venus") for name in current])
+    monkeypatch.setattr(app, "_fetch_page", lambda url, revalidate=False:
+                        f"<html><title>{url}</title><p>Venus page at {url}.</p></html>".encode())
+
+    changed = []
+    for names in result_sets:
+        current[:] = names
+        synthesis = app.run_research_workflow("Venus floating cities", use_search_cache=False, incremental=True)
+        changed.append(synthesis["changed_sources"])
+
+    assert changed[1:] == [["https://c.example/venus", "https://d.example/venus"], [], []]
+
+
+def test_near_duplicate_pages_and_facts_are_collapsed(tmp_path, monkeypatch):
+    """Syndicated copies reuse the original's analysis, drop out of the synthesis and persist in the index"""
+    app = _make_app(tmp_path, monkeypatch)
+    app.response_cache = None
+    article = ("Engineers propose floating habitats 50 km above Venus where the pressure is about 1 bar. "
+               "The study found temperatures near 75 degrees Celsius at that altitude. ") * 3
+    pages = {
+        "https://original.example/venus": f"<html><title>Venus</title><p>{article}</p></html>",
+        "https://copy.example/venus": f"<html><title>Venus (syndicated)</title><p>{article} Share this.</p></html>",
+        "https://other.example/mars": "<html><title>Mars</title><p>Dust storms on Mars can cover the whole "
+                                      "planet for 3 months, research shows. Rovers sleep through them.</p></html>",
+    }
+    monkeypatch.setattr(app, "_fetch_page", lambda url, revalidate=False: pages[url].encode())
+    analysed = []
+    extract_key_facts = app._extract_key_facts
+    monkeypatch.setattr(app, "_extract_key_facts",
+                        lambda content, *args: analysed.append(content) or extract_key_facts(content, *args))
+
+    results = [_make_result(url) for url in pages]
+    app.extract_information(results[:1])
+    extracted = app.extract_information(results)
+    synthesis = app.synthesize_information(extracted)
+
+    assert [info.duplicate_of for info in extracted] == [None, "https://original.example/venus", None]
+    assert len(analysed) == 3  # the original twice, the Mars page once, never the copy
+    assert synthesis["sources"] == ["https://original.example/venus", "https://other.example/mars"]
+    assert synthesis["duplicate_sources"] == ["https://copy.example/venus"]
+    assert len(synthesis["key_facts"]) == len(set(synthesis["key_facts"])) == 3
+    assert app.db.connection().execute("SELECT url, duplicate_of FROM extracted_info ORDER BY id").fetchall()[1:] == [
+        ("https://original.example/venus", None),
+        ("https://copy.example/venus", "https://original.example/venus"),
+        ("https://other.example/mars", None),
+    ]
+    assert {hit["url"] for hit in app.search_corpus("floating habitats")} == {"https://original.example/venus"}
+    assert cluster_near_duplicates(["Venus has a surface pressure of 92 bar.", "Venus has a surface pressure of 92 bars",
+                                    "Mars is cold and dusty."], app.minhasher, 0.7) == [[0, 1], [2]]
+    app.close()
+    assert len(_make_app(tmp_path, monkeypatch).dedup_index) == 2
+
+
+def test_sentence_segmentation_keeps_abbreviations_and_decimals(tmp_path, monkeypatch):
+    """Sentences end at real boundaries only, and facts and summaries come from one segmentation"""
+    app = _make_app(tmp_path, monkeypatch)
+    text = ("Dr. Grinspoon found that the clouds sit 0.72 AU from the Sun. The U.S. team (e.g. NASA) agreed! "
+            "Is it hot? At 50 km the temperature is about 75 degrees. J. R. Smith disagreed.")
+
+    sentences = segment_sentences(text)
+
+    assert [text[s.start:s.end] for s in sentences] == [
+        "Dr. Grinspoon found that the clouds sit 0.72 AU from the Sun.", "The U.S. team (e.g. NASA) agreed!",
+        "Is it hot?", "At 50 km the temperature is about 75 degrees.", "J. R. Smith disagreed."]
+    assert [s.fact_cue for s in sentences] == [True, False, False, True, False]
+    assert app._extract_key_facts(text) == [text[s.start:s.end] for s in sentences if s.fact_cue]
+    assert app._generate_summary(text) == text[:text.index(" At 50 km")]
+    assert len(segment_sentences(text, limit=2)) == 2
+    # "İ" lowercases to two code points, which must not shift where fact cues are looked for
+    assert [s.fact_cue for s in segment_sentences("İ" * 12 + " wins 5 games. Plain words follow here.")] == [True, False]
+
+
+def test_textrank_matches_dense_pagerank_and_summarizes_across_sources():
+    """The matrix-free TextRank equals PageRank on the dense similarity graph, and central sentences win"""
+    sentences = ["Venus clouds hold sulfuric acid droplets.", "Floating habitats would drift in Venus clouds.",
+                 "Acid droplets in the clouds corrode habitats.", "Mars has dust storms.", "Bananas are yellow."]
+    matrix = tfidf_matrix(sentences)
+    dense = np.zeros(matrix.shape)
+    dense[matrix.rows, matrix.cols] = matrix.values
+    similarity = dense @ dense.T
+    np.fill_diagonal(similarity, 0)
+    degree = similarity.sum(axis=1)
+    transition = np.where(degree[:, None] > 0, similarity / np.where(degree > 0, degree, 1)[:, None], 1 / len(sentences))
+    expected = np.full(len(sentences), 1 / len(sentences))
+    for _ in range(200):
+        expected = 0.15 / len(sentences) + 0.85 * transition.T @ expected
+
+    assert np.allclose(rank_sentences(matrix), expected, atol=1e-5)
+    assert np.isclose(matrix.cosine(0, 2), similarity[0, 2])
+
+    documents = ["Our newsletter is published every week for all readers of the site. " * 2,
+                 "Engineers propose floating habitats high in the clouds of Venus. "
+                 "The clouds of Venus hold habitats at a comfortable temperature and pressure.",
+                 "Habitats floating in the Venus clouds would need protection from acid."]
+    summary = summarize_documents(documents, length=2)
+
+    assert "newsletter" not in summary and summary.count("Venus") >= 2